@@ -0,0 +1,387 @@
+"""
+에어코리아(대기질)와 기상청(일별 기상) 관측값을 비동기로 일괄 수집하는 함수 모음.
+
+- 하나의 aiohttp 세션(연결 풀)을 공유하고, 동시 요청 수와 초당 요청 수를 제한합니다.
+- 일시적 오류(연결 오류, 타임아웃, 429/5xx)는 지수 백오프로 재시도합니다.
+- 측정소(지점)별로 날짜 구간을 순서대로 요청하고, 구간이 끝날 때마다
+  마지막 수집 날짜(cursor)를 저장하므로 중단된 수집을 이어서 진행할 수 있습니다.
+  (파일에 이미 있는 날짜는 다시 추가하지 않으므로 같은 구간을 다시 받아도 중복 행이 생기지 않습니다.)
+- 수집 결과는 수작업으로 내려받던 원본과 같은 형식으로 저장됩니다.
+    * 대기질: {output_dir}/{측정소명}.csv  (date, pm25, pm10, o3, no2, so2, co / utf-8)
+      → preprocess_air_quality_data에서 그대로 사용
+    * 기상:   {output_dir}/{지점번호}_{지점명}.csv  (지점, 지점명, 일시, 평균기온(°C), 일강수량(mm), 평균 풍속(m/s) / cp949)
+      → 기상 데이터 전처리에서 그대로 사용
+
+오프라인 테스트/벤치마크는 scripts.stub_api_server의 로컬 대체 서버를 사용합니다.
+
+사용 예 (프로젝트 루트에서 실행):
+    python -m scripts.stub_api_server --port 8080
+    python -m scripts.async_fetcher air --base-url http://127.0.0.1:8080 \\
+        --stations 중구 종로구 --start 2024-01-01 --end 2024-12-31 --output-dir data/raw/air_quality/fetched
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import aiohttp
+
+from scripts.utils import os
+
+AIRKOREA_BASE_URL = "https://apis.data.go.kr/B552584"
+KMA_BASE_URL = "https://apis.data.go.kr/1360000"
+
+AIRKOREA_PATH = "/ArpltnStatsSvc/getMsrstnAcctoRDyrg"
+KMA_PATH = "/AsosDalyInfoService/getWthrDataList"
+
+AIR_CSV_COLUMNS = ["date", "pm25", "pm10", "o3", "no2", "so2", "co"]
+WEATHER_CSV_COLUMNS = ["지점", "지점명", "일시", "평균기온(°C)", "일강수량(mm)", "평균 풍속(m/s)"]
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+# 공공데이터포털 결과 코드: 정상, 데이터 없음(해당 구간 관측값 없음, 예: 운영 전 측정소)
+RESULT_OK = "00"
+RESULT_NODATA = "03"
+
+class RateLimiter:
+    """초당 요청 수를 제한하는 토큰 버킷"""
+
+    def __init__(self, rate_per_sec, burst=None):
+        self.rate = float(rate_per_sec)
+        self.capacity = float(burst or max(1, int(rate_per_sec)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class CursorStore:
+    """측정소(지점)별 마지막 수집 날짜를 json 파일로 관리"""
+
+    def __init__(self, path):
+        self.path = path
+        self.cursors = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.cursors = json.load(f)
+
+    def get(self, key):
+        value = self.cursors.get(key)
+        return date.fromisoformat(value) if value else None
+
+    def set(self, key, value):
+        self.cursors[key] = value.isoformat()
+        # 중간에 중단되어도 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.cursors, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+def _to_date(value):
+    """'YYYY-MM-DD' 문자열 또는 date를 date로 변환"""
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+def iter_date_windows(start, end, window_days):
+    """[start, end] 기간을 window_days일 단위 구간으로 나눔"""
+    cursor = start
+    while cursor <= end:
+        window_end = min(cursor + timedelta(days=window_days - 1), end)
+        yield cursor, window_end
+        cursor = window_end + timedelta(days=1)
+
+async def fetch_json(session, url, params, limiter, semaphore, max_retries=5, backoff_base=0.5, timeout=30):
+    """
+    GET 요청을 보내 json 응답을 반환합니다. 일시적 오류는 지수 백오프로 재시도합니다.
+
+    Parameters:
+        session (aiohttp.ClientSession): 공유 세션 (연결 풀)
+        url (str): 요청 URL
+        params (dict): 쿼리 파라미터
+        limiter (RateLimiter): 초당 요청 수 제한
+        semaphore (asyncio.Semaphore): 동시 요청 수 제한
+        max_retries (int): 최대 재시도 횟수
+        backoff_base (float): 백오프 기본 대기 시간(초)
+        timeout (float): 요청 타임아웃(초)
+
+    Returns:
+        dict: json 응답 (결과 코드가 NODATA이면 item이 없는 응답)
+    """
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        try:
+            async with semaphore:
+                async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                    if resp.status in RETRY_STATUS:
+                        raise aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status)
+                    resp.raise_for_status()
+                    payload = await resp.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            retryable = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUS
+            if not retryable or attempt == max_retries:
+                raise
+            await asyncio.sleep(backoff_base * (2 ** attempt) * (1 + random.random()))
+            continue
+
+        header = payload.get("response", {}).get("header", {})
+        result_code = header.get("resultCode", RESULT_OK)
+        if result_code == RESULT_NODATA:
+            # 데이터 없음은 오류가 아니라 빈 페이지로 처리 (cursor는 계속 진행)
+            return {"response": {"header": header, "body": {"items": [], "totalCount": 0}}}
+        if result_code != RESULT_OK:
+            raise RuntimeError(f"API 오류 {header.get('resultCode')}: {header.get('resultMsg')} ({url})")
+        return payload
+
+    raise RuntimeError(f"재시도 횟수 초과: {url}")
+
+def _extract_items(payload):
+    """공공데이터포털 응답에서 (items 리스트, totalCount) 추출"""
+    body = payload.get("response", {}).get("body", {})
+    items = body.get("items") or []
+    # 기상청 응답은 items = {"item": [...]} 형태
+    if isinstance(items, dict):
+        items = items.get("item") or []
+    return items, int(body.get("totalCount", len(items)))
+
+async def fetch_paged(session, url, params, limiter, semaphore, page_size=1000, **retry_kwargs):
+    """페이지를 모두 요청하여 item 리스트를 이어 붙여 반환"""
+    items = []
+    page = 1
+    while True:
+        payload = await fetch_json(
+            session, url, {**params, "pageNo": page, "numOfRows": page_size},
+            limiter, semaphore, **retry_kwargs
+        )
+        page_items, total = _extract_items(payload)
+        items.extend(page_items)
+        if not page_items or len(items) >= total:
+            return items
+        page += 1
+
+def _air_item_to_row(item):
+    """에어코리아 일평균 item → 원본 대기질 CSV 행"""
+    measured = _to_date(item["msurDt"])
+    return [
+        f"{measured.year}/{measured.month}/{measured.day}",
+        item.get("pm25Value") or "",
+        item.get("pm10Value") or "",
+        item.get("o3Value") or "",
+        item.get("no2Value") or "",
+        item.get("so2Value") or "",
+        item.get("coValue") or "",
+    ]
+
+def _weather_item_to_row(item):
+    """기상청 일자료 item → 원본 기상 CSV 행"""
+    return [
+        item.get("stnId", ""),
+        item.get("stnNm", ""),
+        str(item["tm"])[:10],
+        item.get("avgTa") or "",
+        item.get("sumRn") or "",
+        item.get("avgWs") or "",
+    ]
+
+def _row_date(value):
+    """CSV 날짜 값('YYYY/M/D' 또는 'YYYY-MM-DD')을 date로 변환 (변환할 수 없으면 None)"""
+    try:
+        year, month, day = (int(part) for part in str(value).strip()[:10].replace("/", "-").split("-"))
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+def _read_saved_dates(file_path, date_index, encoding):
+    """이미 저장된 CSV의 날짜 집합 (파일이 없으면 빈 집합)"""
+    if not os.path.exists(file_path):
+        return set()
+    with open(file_path, encoding=encoding, newline="") as f:
+        reader = csv.reader(f, skipinitialspace=True)
+        next(reader, None)
+        return {_row_date(row[date_index]) for row in reader if len(row) > date_index} - {None}
+
+def _append_rows(file_path, header_line, rows, encoding):
+    """CSV 파일에 행을 추가 (파일이 없으면 헤더부터 작성)"""
+    write_header = not os.path.exists(file_path)
+    with open(file_path, "a", encoding=encoding, newline="") as f:
+        if write_header:
+            f.write(header_line + "\n")
+        writer = csv.writer(f)
+        writer.writerows(rows)
+
+async def _fetch_station(session, spec, station, start, end, output_dir, cursors, limiter, semaphore, window_days, retry_kwargs):
+    """
+    한 측정소(지점)의 기간을 구간 단위로 순서대로 수집
+
+    행 추가와 cursor 저장 사이에 중단되면 재시작 시 같은 구간을 다시 받게 되므로,
+    cursor 이하 날짜와 파일에 이미 저장된 날짜의 행은 추가하지 않습니다. (구간 저장을 멱등하게 유지)
+    """
+    cursor_key = f"{spec['kind']}:{station}"
+    last_done = cursors.get(cursor_key)
+    if last_done is not None:
+        start = max(start, last_done + timedelta(days=1))
+
+    # 파일 경로별 저장된 날짜 (파일마다 처음 한 번만 읽음)
+    saved_dates = {}
+    date_index = spec["date_index"]
+
+    n_rows = 0
+    for window_start, window_end in iter_date_windows(start, end, window_days):
+        params = spec["params"](station, window_start, window_end)
+        items = await fetch_paged(session, spec["url"], params, limiter, semaphore, **retry_kwargs)
+
+        rows = [spec["to_row"](item) for item in items]
+        if rows:
+            file_path = spec["file_path"](output_dir, station, items)
+            if file_path not in saved_dates:
+                saved_dates[file_path] = _read_saved_dates(file_path, date_index, spec["encoding"])
+            seen = saved_dates[file_path]
+
+            new_rows = []
+            for row in rows:
+                row_date = _row_date(row[date_index])
+                if row_date is not None:
+                    if row_date in seen or (last_done is not None and row_date <= last_done):
+                        continue
+                    seen.add(row_date)
+                new_rows.append(row)
+
+            if new_rows:
+                _append_rows(file_path, spec["header_line"], new_rows, spec["encoding"])
+                n_rows += len(new_rows)
+        cursors.set(cursor_key, window_end)
+
+    return station, n_rows
+
+def _air_spec(base_url, service_key):
+    """에어코리아 측정소별 일평균 자료 요청 명세"""
+    return {
+        "kind": "air",
+        "url": base_url.rstrip("/") + AIRKOREA_PATH,
+        "params": lambda station, s, e: {
+            "serviceKey": service_key, "returnType": "json", "msrstnName": station,
+            "inqBginDt": s.strftime("%Y%m%d"), "inqEndDt": e.strftime("%Y%m%d"),
+        },
+        "to_row": _air_item_to_row,
+        "date_index": AIR_CSV_COLUMNS.index("date"),
+        "file_path": lambda output_dir, station, items: os.path.join(output_dir, f"{station}.csv"),
+        # 원본 대기질 파일과 동일하게 ', ' 구분 헤더 사용
+        "header_line": ", ".join(AIR_CSV_COLUMNS),
+        "encoding": "utf-8",
+    }
+
+def _weather_spec(base_url, service_key):
+    """기상청 지점별 일자료 요청 명세"""
+    return {
+        "kind": "weather",
+        "url": base_url.rstrip("/") + KMA_PATH,
+        "params": lambda station, s, e: {
+            "serviceKey": service_key, "dataType": "JSON", "dataCd": "ASOS", "dateCd": "DAY",
+            "stnIds": station, "startDt": s.strftime("%Y%m%d"), "endDt": e.strftime("%Y%m%d"),
+        },
+        "to_row": _weather_item_to_row,
+        "date_index": WEATHER_CSV_COLUMNS.index("일시"),
+        "file_path": lambda output_dir, station, items: os.path.join(output_dir, f"{station}_{items[0].get('stnNm', '')}.csv"),
+        "header_line": ",".join(WEATHER_CSV_COLUMNS),
+        "encoding": "cp949",
+    }
+
+async def fetch_observations(kind, stations, start_date, end_date, output_dir, base_url=None, service_key=None,
+                             concurrency=8, rate_per_sec=10, window_days=31, max_retries=5, backoff_base=0.5):
+    """
+    여러 측정소(지점)의 관측값을 비동기로 수집하여 원본 CSV 형식으로 저장합니다.
+
+    Parameters:
+        kind (str): 'air'(에어코리아 대기질) 또는 'weather'(기상청 일자료)
+        stations (list): 측정소명(대기질, 예: '중구') 또는 지점번호(기상, 예: '108') 리스트
+        start_date (str): 수집 시작 날짜 (YYYY-MM-DD)
+        end_date (str): 수집 종료 날짜 (YYYY-MM-DD)
+        output_dir (str): 저장 디렉토리 (cursor 파일 '.fetch_cursor.json'도 함께 저장)
+        base_url (str): API 기본 URL (기본값: 공공데이터포털, 로컬 대체 서버 사용 시 변경)
+        service_key (str): 공공데이터포털 인증키 (기본값: 환경변수 DATA_GO_KR_SERVICE_KEY)
+        concurrency (int): 동시 요청 수 (연결 풀 크기)
+        rate_per_sec (float): 초당 최대 요청 수
+        window_days (int): 요청 1회당 날짜 구간 길이(일)
+        max_retries (int): 최대 재시도 횟수
+        backoff_base (float): 백오프 기본 대기 시간(초)
+
+    Returns:
+        tuple:
+            - results (dict): {측정소: 수집한 행 수} (성공한 측정소)
+            - failures (dict): {측정소: 예외} (실패한 측정소, 다른 측정소의 수집은 계속 진행됨)
+    """
+    if kind == "air":
+        spec = _air_spec(base_url or AIRKOREA_BASE_URL, service_key or os.environ.get("DATA_GO_KR_SERVICE_KEY", ""))
+    elif kind == "weather":
+        spec = _weather_spec(base_url or KMA_BASE_URL, service_key or os.environ.get("DATA_GO_KR_SERVICE_KEY", ""))
+    else:
+        raise ValueError(f"지원하지 않는 수집 종류입니다: {kind}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    cursors = CursorStore(os.path.join(output_dir, ".fetch_cursor.json"))
+    limiter = RateLimiter(rate_per_sec)
+    semaphore = asyncio.Semaphore(concurrency)
+    retry_kwargs = {"max_retries": max_retries, "backoff_base": backoff_base}
+
+    start, end = _to_date(start_date), _to_date(end_date)
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # 한 측정소가 실패해도 나머지 측정소 작업이 끝날 때까지 세션을 유지
+        outcomes = await asyncio.gather(*[
+            _fetch_station(session, spec, str(station), start, end, output_dir, cursors, limiter, semaphore, window_days, retry_kwargs)
+            for station in stations
+        ], return_exceptions=True)
+
+    results, failures = {}, {}
+    for station, outcome in zip(stations, outcomes):
+        if isinstance(outcome, BaseException):
+            failures[str(station)] = outcome
+        else:
+            results[outcome[0]] = outcome[1]
+    return results, failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="에어코리아/기상청 관측값 비동기 일괄 수집")
+    parser.add_argument("kind", choices=["air", "weather"])
+    parser.add_argument("--stations", nargs="+", required=True, help="측정소명(air) 또는 지점번호(weather)")
+    parser.add_argument("--start", required=True, help="시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="종료 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--output-dir", required=True)
+    parser.add_argument("--base-url", default=None, help="API 기본 URL (로컬 대체 서버: http://127.0.0.1:8080)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=10, help="초당 최대 요청 수")
+    parser.add_argument("--window-days", type=int, default=31)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results, failures = asyncio.run(fetch_observations(
+        args.kind, args.stations, args.start, args.end, args.output_dir,
+        base_url=args.base_url, concurrency=args.concurrency,
+        rate_per_sec=args.rate, window_days=args.window_days
+    ))
+    elapsed = time.perf_counter() - started
+
+    for station, n_rows in results.items():
+        print(f"{station}: {n_rows}행")
+    for station, error in failures.items():
+        print(f"{station}: 실패 ({type(error).__name__}: {error})")
+    print(f"수집 완료: {len(results)}개 측정소, {sum(results.values())}행 ({elapsed:.2f}s)")
+    if failures:
+        raise SystemExit(f"{len(failures)}개 측정소 수집 실패: {', '.join(failures)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+어린이집 전체를 대상으로 PM10 예측을 일괄 수행하기 위한 함수 모음.
+
+같은 측정소에 속한 어린이집들은 (측정소, 날짜) 단위로 입력 특성이 모두 동일하므로,
+고유한 측정소-날짜(또는 측정소-예보시각) 특성 벡터에 대해서만 모델을 평가한 뒤
+인덱스 배열을 이용해 어린이집 단위로 결과를 펼쳐(broadcast) 저장합니다.
+
+사용 예 (프로젝트 루트에서 실행):
+    python -m scripts.bulk_scoring \\
+        --model models/random_forest.joblib \\
+        --stations data/processed/forecast/station_forecast.csv \\
+        --daycares data/processed/daycarecenter/daycarecenter_preprocessed.csv \\
+        --output-dir data/processed/prediction
+"""
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+
+from scripts.model_utils import get_feature_columns
+from scripts.utils import os, pd, save_to_csv
+
+# 워커 프로세스마다 한 번만 역직렬화한 모델을 보관
+_worker_model = None
+
+def _init_worker(model):
+    """워커 프로세스 초기화: 모델을 전역에 보관하고 내부 병렬화는 끔"""
+    global _worker_model
+    if hasattr(model, "n_jobs"):
+        model.set_params(n_jobs=1)
+    _worker_model = model
+
+def _predict_chunk(X_chunk):
+    """워커에서 한 청크를 예측"""
+    return _worker_model.predict(X_chunk)
+
+def dedup_feature_rows(df, feature_columns, key_columns=("측정소명", "날짜")):
+    """
+    (키 컬럼 + 특성 컬럼) 조합이 동일한 행을 하나로 묶어 고유 특성 행렬과 역인덱스를 반환합니다.
+
+    Parameters:
+        df (pd.DataFrame): 예측 대상 데이터프레임 (어린이집 단위 행)
+        feature_columns (list): 모델 입력 특성 컬럼 리스트
+        key_columns (tuple): 중복 제거 기준 키 컬럼 (기본값: 측정소명, 날짜)
+
+    Returns:
+        tuple:
+            - unique_df (pd.DataFrame): 고유 (키 + 특성) 행
+            - inverse (np.ndarray): 원본 각 행이 unique_df의 몇 번째 행에 대응하는지 나타내는 인덱스 배열
+    """
+    key_columns = [col for col in key_columns if col in df.columns]
+    dedup_columns = key_columns + [col for col in feature_columns if col not in key_columns]
+
+    # 다중 컬럼 조합별 그룹 번호를 한 번에 계산 (결측값도 하나의 값으로 취급)
+    inverse = df.groupby(dedup_columns, sort=False, dropna=False).ngroup().to_numpy()
+
+    # 각 그룹의 첫 번째 등장 위치를 대표 행으로 사용
+    _, first_positions = np.unique(inverse, return_index=True)
+    unique_df = df.iloc[first_positions][dedup_columns].reset_index(drop=True)
+
+    return unique_df, inverse
+
+def predict_in_chunks(model, X, chunk_size=200_000, n_jobs=None):
+    """
+    입력 특성을 큰 청크로 나누어 여러 워커 프로세스에서 예측합니다.
+
+    Parameters:
+        model: 학습된 회귀 모델
+        X (pd.DataFrame): 모델 입력 특성
+        chunk_size (int): 청크당 행 수 (기본값: 200,000)
+        n_jobs (int): 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+
+    Returns:
+        np.ndarray: 예측값 배열 (X와 같은 순서)
+    """
+    n_rows = len(X)
+    if n_rows == 0:
+        return np.empty(0, dtype=np.float64)
+
+    chunks = [X.iloc[start:start + chunk_size] for start in range(0, n_rows, chunk_size)]
+
+    # 청크가 하나뿐이거나 단일 프로세스 요청이면 프로세스 풀을 띄우지 않음
+    if n_jobs == 1 or len(chunks) == 1:
+        return model.predict(X)
+
+    max_workers = min(n_jobs or os.cpu_count() or 1, len(chunks))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(model,)) as executor:
+        results = list(executor.map(_predict_chunk, chunks))
+
+    return np.concatenate(results)
+
+def bulk_predict_pm10(model, input_df, use_pm25=True, key_columns=("측정소명", "날짜"), chunk_size=200_000, n_jobs=None):
+    """
+    predict_pm10의 일괄 처리 버전입니다.
+    고유한 측정소-날짜 특성 벡터만 예측한 뒤, 결과를 원본 행(어린이집 단위)으로 펼칩니다.
+
+    Parameters:
+        model: 학습된 회귀 모델
+        input_df (pd.DataFrame): 예측에 사용할 입력 데이터프레임 (예: 어린이집-대기질-기상 통합 데이터)
+        use_pm25 (bool): True이면 pm25 포함 특성 사용
+        key_columns (tuple): 중복 제거 기준 키 컬럼 (기본값: 측정소명, 날짜)
+        chunk_size (int): 청크당 행 수
+        n_jobs (int): 워커 프로세스 수
+
+    Returns:
+        pd.DataFrame: '예측_PM10' 컬럼이 추가된 데이터프레임
+    """
+    feature_columns = get_feature_columns(use_pm25)
+    unique_df, inverse = dedup_feature_rows(input_df, feature_columns, key_columns)
+
+    unique_pred = predict_in_chunks(model, unique_df[feature_columns], chunk_size=chunk_size, n_jobs=n_jobs)
+
+    result_df = input_df.copy()
+    result_df["예측_PM10"] = unique_pred[inverse]
+    return result_df
+
+def score_daycare_forecast(model, station_df, daycare_df, use_pm25=False, time_col="날짜", station_col="측정소명", chunk_size=200_000, n_jobs=None):
+    """
+    측정소별 예보 특성(측정소 x 날짜/예보시각)을 예측하고, 어린이집 전체로 결과를 펼칩니다.
+
+    - 예측은 고유한 측정소-시점 행에 대해서만 수행합니다.
+    - 어린이집마다 소속 측정소의 정수 코드를 구해, (시점 x 측정소) 예측 행렬에서
+      인덱스 배열로 한 번에 값을 가져옵니다.
+
+    Parameters:
+        model: 학습된 회귀 모델
+        station_df (pd.DataFrame): 측정소별 예보 특성 (station_col, time_col, 특성 컬럼 포함, month 없으면 time_col로 생성)
+        daycare_df (pd.DataFrame): 어린이집 정보 (station_col 포함, 예: 전처리된 '측정소' 컬럼을 '측정소명'으로 변경한 데이터)
+        use_pm25 (bool): True이면 pm25 포함 특성 사용 (예보 시점에는 보통 pm25가 없으므로 기본값 False)
+        time_col (str): 날짜 또는 예보시각 컬럼명
+        station_col (str): 측정소명 컬럼명
+        chunk_size (int): 청크당 행 수
+        n_jobs (int): 워커 프로세스 수
+
+    Returns:
+        pd.DataFrame: 어린이집 x 시점 단위 예측 결과 (time_col, station_col, 어린이집 컬럼들, '예측_PM10')
+    """
+    feature_columns = get_feature_columns(use_pm25)
+
+    station_df = station_df.copy()
+    station_df[time_col] = pd.to_datetime(station_df[time_col])
+    if "month" not in station_df.columns:
+        station_df["month"] = station_df[time_col].dt.month
+
+    unique_df, _ = dedup_feature_rows(station_df, feature_columns, key_columns=(station_col, time_col))
+    if unique_df.duplicated([station_col, time_col]).any():
+        raise ValueError(f"측정소-시점({station_col}, {time_col})마다 특성 행이 하나여야 합니다.")
+
+    unique_pred = predict_in_chunks(model, unique_df[feature_columns], chunk_size=chunk_size, n_jobs=n_jobs)
+
+    # 측정소/시점을 정수 코드로 변환하여 (시점 x 측정소) 예측 행렬 구성
+    time_codes, times = pd.factorize(unique_df[time_col], sort=True)
+    station_codes, stations = pd.factorize(unique_df[station_col], sort=True)
+    pred_matrix = np.full((len(times), len(stations)), np.nan)
+    pred_matrix[time_codes, station_codes] = unique_pred
+
+    # 어린이집별 소속 측정소 코드 (예보가 없는 측정소는 제외)
+    daycare_station_codes = stations.get_indexer(daycare_df[station_col])
+    daycare_df = daycare_df[daycare_station_codes >= 0].reset_index(drop=True)
+    daycare_station_codes = daycare_station_codes[daycare_station_codes >= 0]
+
+    # 어린이집 정보를 시점 수만큼 반복하고, 예측값은 인덱스 배열로 한 번에 가져옴
+    n_daycares = len(daycare_df)
+    result_df = daycare_df.iloc[np.tile(np.arange(n_daycares), len(times))].reset_index(drop=True)
+    result_df.insert(0, time_col, np.repeat(times.values, n_daycares))
+    result_df["예측_PM10"] = pred_matrix[:, daycare_station_codes].ravel()
+
+    return result_df
+
+def save_partitioned(df, output_dir, partition_col="날짜", prefix="prediction_"):
+    """
+    예측 결과를 partition_col 값별로 나누어 CSV 파일로 저장합니다.
+
+    Parameters:
+        df (pd.DataFrame): 저장할 데이터프레임
+        output_dir (str): 저장할 디렉토리 경로
+        partition_col (str): 파일을 나누는 기준 컬럼 (기본값: '날짜')
+        prefix (str): 파일명 접두사
+
+    Returns:
+        list: 저장된 파티션 키 리스트
+    """
+    # 시각 정보가 있는 경우(예보시각) 시간 단위까지 파일명에 포함
+    key_format = "%Y%m%d"
+    if pd.api.types.is_datetime64_any_dtype(df[partition_col]) and (df[partition_col].dt.hour != 0).any():
+        key_format = "%Y%m%d%H"
+
+    partition_keys = []
+    for key, part_df in df.groupby(partition_col, sort=True):
+        if isinstance(key, pd.Timestamp):
+            key = key.strftime(key_format)
+        save_to_csv(part_df, output_dir=output_dir, file_name=f"{prefix}{key}")
+        partition_keys.append(key)
+    return partition_keys
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="측정소별 예보 특성으로 어린이집 PM10 일괄 예측")
+    parser.add_argument("--model", required=True, help="joblib으로 저장한 학습 모델 경로")
+    parser.add_argument("--stations", required=True, help="측정소별 예보 특성 CSV 경로")
+    parser.add_argument("--daycares", required=True, help="어린이집 전처리 CSV 경로")
+    parser.add_argument("--output-dir", required=True, help="예측 결과 저장 디렉토리")
+    parser.add_argument("--use-pm25", action="store_true", help="pm25 포함 특성으로 학습한 모델인 경우 지정")
+    parser.add_argument("--time-col", default="날짜", help="날짜 또는 예보시각 컬럼명 (기본값: 날짜)")
+    parser.add_argument("--chunk-size", type=int, default=200_000)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    model = joblib.load(args.model)
+    station_df = pd.read_csv(args.stations, encoding="utf-8")
+    daycare_df = pd.read_csv(args.daycares, encoding="utf-8")
+    # 어린이집 전처리 결과의 '측정소' 컬럼을 예보 데이터와 같은 이름으로 맞춤
+    daycare_df = daycare_df.rename(columns={"측정소": "측정소명"})
+
+    result_df = score_daycare_forecast(
+        model, station_df, daycare_df,
+        use_pm25=args.use_pm25, time_col=args.time_col,
+        chunk_size=args.chunk_size, n_jobs=args.n_jobs
+    )
+    partitions = save_partitioned(result_df, args.output_dir, partition_col=args.time_col)
+
+    elapsed = time.perf_counter() - start
+    print(f"예측 완료: 어린이집 {daycare_df.shape[0]}곳 x {len(partitions)}개 시점 → {args.output_dir} ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
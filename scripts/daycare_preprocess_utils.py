@@ -0,0 +1,237 @@
+import glob
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from scripts.utils import os, pd, strip_column_names
+
+# haversine 라이브러리와 동일한 지구 평균 반지름(km)
+EARTH_RADIUS_KM = 6371.0088
+
+# 운영 중인 어린이집으로 볼 운영현황 값
+ACTIVE_STATUS = ['정상', '재개']
+
+# 어린이집 고유 ID 생성에 사용하는 컬럼 (위치가 바뀌어도 변하지 않는 값)
+# 이름/인가일자가 같은 어린이집은 전화번호로 구분 (행 순서와 무관하게 같은 ID 유지)
+DAYCARE_ID_COLUMNS = ['시군구', '어린이집명', '인가일자', '어린이집전화번호']
+
+DAYCARE_COLUMNS = ['시군구', '어린이집명', '주소', '위도', '경도']
+_ID_ONLY_COLUMNS = [col for col in DAYCARE_ID_COLUMNS if col not in DAYCARE_COLUMNS]
+
+def read_daycare_file(file_path, encoding='utf-8'):
+    """
+    구별 어린이집 CSV 하나를 읽어, 필요한 컬럼만 남기고 운영 중인 어린이집만 반환하는 함수
+
+    Parameters:
+        file_path (str): 어린이집 CSV 경로 (예: '../data/raw/daycarecenter/daycarecenter_jung.csv')
+        encoding (str): 파일 인코딩 (기본값: 'utf-8')
+
+    Returns:
+        pd.DataFrame: 시군구, 어린이집명, 주소, 위도, 경도, 인가일자, 어린이집전화번호 컬럼
+    """
+    keep = set(DAYCARE_COLUMNS) | set(DAYCARE_ID_COLUMNS) | {'운영현황'}
+
+    df = pd.read_csv(
+        file_path,
+        encoding=encoding,
+        usecols=lambda col: col.strip() in keep,
+        dtype={'인가일자': 'str', '운영현황': 'str', '어린이집전화번호': 'str'},
+    )
+    df = strip_column_names(df)
+
+    # "운영현황"이 "정상" 또는 "재개"인 데이터만 필터링 (읽은 직후 파일 단위로 수행)
+    df = df[df['운영현황'].isin(ACTIVE_STATUS)]
+
+    return df[DAYCARE_COLUMNS + _ID_ONLY_COLUMNS]
+
+def add_daycare_id(df):
+    """
+    시군구, 어린이집명, 인가일자, 어린이집전화번호(숫자만)로 어린이집 고유 ID(daycare_id, uint64)를 생성하는 함수
+    행 순서에 의존하지 않으므로 파일을 다시 정렬하거나 다른 어린이집이 폐원해도 ID가 바뀌지 않습니다.
+
+    Parameters:
+        df (pd.DataFrame): 어린이집 데이터프레임
+
+    Returns:
+        pd.DataFrame: daycare_id 컬럼이 추가된 데이터프레임
+    """
+    df = df.copy()
+    id_frame = df[DAYCARE_ID_COLUMNS].fillna('').astype(str)
+    # 전화번호 표기 차이(하이픈, 공백 등)는 무시
+    id_frame['어린이집전화번호'] = id_frame['어린이집전화번호'].str.replace(r'\D', '', regex=True)
+    df['daycare_id'] = pd.util.hash_pandas_object(id_frame, index=False).to_numpy()
+    return df
+
+def load_daycare_registry(folder_path='../data/raw/daycarecenter', max_workers=8):
+    """
+    구별 어린이집 CSV를 병렬로 읽어 한 번에 합치는 함수
+
+    Parameters:
+        folder_path (str): 어린이집 원본 CSV 폴더 경로
+        max_workers (int): 동시에 읽을 파일 수
+
+    Returns:
+        pd.DataFrame: daycare_id, 시군구, 어린이집명, 주소, 위도(float), 경도(float), 인가일자, 어린이집전화번호
+                      (ID 컬럼 값이 모두 같은 행은 중복 등록으로 보고 첫 행만 남김)
+    """
+    files = sorted(glob.glob(os.path.join(folder_path, '*.csv')))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(read_daycare_file, files))
+
+    # 루프 안에서 매번 concat하지 않고 마지막에 한 번만 합침
+    registry_df = pd.concat(frames, ignore_index=True)
+
+    # 위도, 경도를 숫자형으로 변환
+    registry_df['위도'] = pd.to_numeric(registry_df['위도'], errors='coerce')
+    registry_df['경도'] = pd.to_numeric(registry_df['경도'], errors='coerce')
+
+    registry_df = add_daycare_id(registry_df)
+    registry_df = registry_df.drop_duplicates('daycare_id').reset_index(drop=True)
+    return registry_df[['daycare_id'] + DAYCARE_COLUMNS + _ID_ONLY_COLUMNS]
+
+def haversine_matrix(lat1, lon1, lat2, lon2):
+    """
+    두 좌표 집합 사이의 haversine 거리(km) 행렬을 계산하는 함수
+
+    Parameters:
+        lat1, lon1 (array-like): 첫 번째 좌표 집합 (n개)
+        lat2, lon2 (array-like): 두 번째 좌표 집합 (m개)
+
+    Returns:
+        np.ndarray: (n, m) 거리 행렬
+    """
+    lat1 = np.radians(np.asarray(lat1, dtype=np.float64))[:, None]
+    lon1 = np.radians(np.asarray(lon1, dtype=np.float64))[:, None]
+    lat2 = np.radians(np.asarray(lat2, dtype=np.float64))[None, :]
+    lon2 = np.radians(np.asarray(lon2, dtype=np.float64))[None, :]
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def assign_nearest_station(daycare_df, station_df):
+    """
+    각 어린이집에 가장 가까운 측정소와 거리를 계산하는 함수 (거리 행렬 한 번에 계산)
+
+    Parameters:
+        daycare_df (pd.DataFrame): 어린이집 데이터 (위도, 경도 포함)
+        station_df (pd.DataFrame): 측정소 위치 데이터 (측정소명, 위도, 경도 포함)
+
+    Returns:
+        pd.DataFrame: '측정소', '측정소까지거리(km)' 컬럼이 추가된 데이터프레임
+                      (좌표가 없는 어린이집은 두 값 모두 결측)
+    """
+    daycare_df = daycare_df.copy()
+    station_lat = pd.to_numeric(station_df['위도'], errors='coerce').to_numpy()
+    station_lon = pd.to_numeric(station_df['경도'], errors='coerce').to_numpy()
+    station_names = station_df['측정소명'].to_numpy(dtype=object)
+
+    lat = daycare_df['위도'].to_numpy(dtype=np.float64)
+    lon = daycare_df['경도'].to_numpy(dtype=np.float64)
+    has_coord = ~(np.isnan(lat) | np.isnan(lon))
+
+    nearest_stations = np.full(len(daycare_df), None, dtype=object)
+    nearest_distances = np.full(len(daycare_df), np.nan)
+
+    if has_coord.any():
+        distances = haversine_matrix(lat[has_coord], lon[has_coord], station_lat, station_lon)
+        min_idx = distances.argmin(axis=1)
+        nearest_stations[has_coord] = station_names[min_idx]
+        nearest_distances[has_coord] = distances[np.arange(len(min_idx)), min_idx]
+
+    daycare_df['측정소'] = nearest_stations
+    daycare_df['측정소까지거리(km)'] = nearest_distances
+    return daycare_df
+
+def diff_registry_snapshots(old_df, new_df, move_tolerance_km=0.01):
+    """
+    이전/새 어린이집 목록을 daycare_id로 비교하여 신규, 폐원, 이전(위치 변경) 어린이집을 구하는 함수
+
+    Parameters:
+        old_df (pd.DataFrame): 이전 목록 (daycare_id, 주소, 위도, 경도 포함)
+        new_df (pd.DataFrame): 새 목록 (daycare_id, 주소, 위도, 경도 포함)
+        move_tolerance_km (float): 이 거리보다 좌표가 많이 바뀌면 이전으로 판단 (기본값: 10m)
+
+    Returns:
+        dict:
+            - 'added' (pd.DataFrame): 새 목록에만 있는 어린이집
+            - 'closed' (pd.DataFrame): 이전 목록에만 있는 어린이집
+            - 'moved' (pd.DataFrame): 양쪽에 있지만 주소 또는 좌표가 바뀐 어린이집 (새 목록 기준)
+    """
+    old_ids = old_df['daycare_id'].to_numpy()
+    new_ids = new_df['daycare_id'].to_numpy()
+
+    added = new_df[~np.isin(new_ids, old_ids)]
+    closed = old_df[~np.isin(old_ids, new_ids)]
+
+    # 양쪽에 모두 있는 어린이집의 주소/좌표 비교
+    common = new_df[np.isin(new_ids, old_ids)]
+    old_common = old_df.set_index('daycare_id').loc[common['daycare_id'], ['주소', '위도', '경도']]
+
+    new_lat, new_lon = common['위도'].to_numpy(dtype=np.float64), common['경도'].to_numpy(dtype=np.float64)
+    old_lat, old_lon = old_common['위도'].to_numpy(dtype=np.float64), old_common['경도'].to_numpy(dtype=np.float64)
+
+    # 같은 행끼리의 거리만 필요하므로 행렬 대신 원소별로 계산
+    lat1, lon1, lat2, lon2 = map(np.radians, (old_lat, old_lon, new_lat, new_lon))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    moved_distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    coord_changed = (moved_distance > move_tolerance_km) | (np.isnan(old_lat) != np.isnan(new_lat))
+    address_changed = old_common['주소'].fillna('').to_numpy() != common['주소'].fillna('').to_numpy()
+    moved = common[coord_changed | address_changed]
+
+    return {'added': added, 'closed': closed, 'moved': moved}
+
+def apply_registry_delta(prev_df, new_snapshot_df, station_df, move_tolerance_km=0.01):
+    """
+    새 어린이집 목록이 들어왔을 때, 바뀐 어린이집만 가장 가까운 측정소를 다시 계산하는 함수
+    대기질/기상 데이터와의 결합은 rejoin_registry_delta에 delta를 넘겨 바뀐 어린이집만 다시 수행합니다.
+
+    Parameters:
+        prev_df (pd.DataFrame): 이전에 측정소가 배정된 어린이집 데이터 (assign_nearest_station 결과)
+        new_snapshot_df (pd.DataFrame): 새 어린이집 목록 (load_daycare_registry 결과)
+        station_df (pd.DataFrame): 측정소 위치 데이터
+        move_tolerance_km (float): 위치 변경 판단 기준 거리(km)
+
+    Returns:
+        tuple:
+            - updated_df (pd.DataFrame): 측정소가 배정된 최신 어린이집 데이터
+            - delta (dict): diff_registry_snapshots 결과 (신규/폐원/이전 어린이집)
+                            + 'changed_ids' (np.ndarray): 신규/폐원/이전 어린이집의 daycare_id
+    """
+    delta = diff_registry_snapshots(prev_df, new_snapshot_df, move_tolerance_km)
+
+    # 폐원/이전 어린이집은 기존 결과에서 제거
+    drop_ids = np.concatenate([delta['closed']['daycare_id'].to_numpy(), delta['moved']['daycare_id'].to_numpy()])
+    kept_df = prev_df[~np.isin(prev_df['daycare_id'].to_numpy(), drop_ids)]
+
+    # 신규/이전 어린이집만 측정소 재배정
+    changed_df = pd.concat([delta['added'], delta['moved']], ignore_index=True)
+    changed_df = assign_nearest_station(changed_df, station_df)
+
+    updated_df = pd.concat([kept_df, changed_df[kept_df.columns]], ignore_index=True)
+    delta['changed_ids'] = np.concatenate([drop_ids, delta['added']['daycare_id'].to_numpy()])
+    return updated_df, delta
+
+def rejoin_registry_delta(joined_df, updated_df, station_daily_df, changed_ids):
+    """
+    어린이집-대기질-기상 결합 데이터에서 바뀐 어린이집 행만 다시 결합하는 함수
+    (merge_processed_data 노트북과 같은 방식: 측정소명 기준 inner join)
+
+    Parameters:
+        joined_df (pd.DataFrame): 이전 결합 결과 (daycare_id 컬럼 포함)
+        updated_df (pd.DataFrame): apply_registry_delta의 최신 어린이집 데이터
+        station_daily_df (pd.DataFrame): 측정소-날짜별 대기질/기상 데이터 (측정소명 컬럼 포함)
+        changed_ids (array-like): apply_registry_delta가 반환한 delta['changed_ids']
+
+    Returns:
+        pd.DataFrame: 바뀌지 않은 어린이집의 기존 행 + 신규/이전 어린이집의 새 결합 행
+    """
+    changed_ids = np.asarray(changed_ids)
+    kept_df = joined_df[~np.isin(joined_df['daycare_id'].to_numpy(), changed_ids)]
+
+    # 노트북과 같은 컬럼명으로 맞춘 뒤 바뀐 어린이집만 결합 (폐원 어린이집은 updated_df에 없으므로 제외됨)
+    changed_df = updated_df[np.isin(updated_df['daycare_id'].to_numpy(), changed_ids)]
+    changed_df = changed_df.rename(columns={'측정소': '측정소명', '시군구': '어린이집 위치'})
+    changed_df = changed_df[[col for col in changed_df.columns if col in joined_df.columns]]
+    rejoined_df = pd.merge(station_daily_df, changed_df, on=['측정소명'], how='inner')
+
+    return pd.concat([kept_df, rejoined_df[kept_df.columns]], ignore_index=True)
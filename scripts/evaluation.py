@@ -0,0 +1,203 @@
+"""
+측정소별/월별/PM10 등급별 회귀 성능 지표와 부트스트랩 신뢰구간을 계산하는 함수 모음.
+
+- 모든 그룹 기준(예: 측정소명, month, pm10등급)과 전체를 하나의 정수 그룹 코드 공간으로 쌓은 뒤,
+  np.bincount 한 번으로 그룹별 합계(개수, Σy, Σy², Σ오차², Σ|오차|)를 구해 MSE/RMSE/MAE/R²를 계산합니다.
+- 부트스트랩은 그룹 안에서 복원 추출한 인덱스 행렬(반복 수 x 행 수)을 만들어
+  같은 합계 계산을 반복 단위로 한 번에 수행하고, 반복 묶음은 프로세스 풀에서 병렬로 처리합니다.
+- 결과는 (그룹기준, 그룹, metric, value, ci_lower, ci_upper, n) 형식의 tidy 표이며,
+  특정 그룹 행만 골라 plot_regression_metrics_bar에 그대로 넘길 수 있습니다.
+"""
+
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from scripts.utils import pd
+
+METRIC_NAMES = ["MSE", "RMSE", "MAE", "R²"]
+
+# 환경부 PM10 예보 등급 기준 (24시간 평균, µg/m³)
+PM10_GRADE_BINS = [30, 80, 150]
+PM10_GRADE_LABELS = ["좋음", "보통", "나쁨", "매우 나쁨"]
+
+# 부트스트랩 인덱스 행렬 한 묶음의 최대 원소 수 (메모리 제한)
+_MAX_BOOTSTRAP_CELLS = 5_000_000
+
+def pm10_grade_band(values):
+    """
+    PM10 농도를 등급(좋음/보통/나쁨/매우 나쁨)으로 변환합니다. (plot_bad_pm10_heatmap의 등급 기준과 동일)
+
+    Parameters:
+        values (array-like): PM10 농도
+
+    Returns:
+        pd.Categorical: PM10 등급
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.digitize(values, PM10_GRADE_BINS, right=True)
+    codes[np.isnan(values)] = -1
+    return pd.Categorical.from_codes(codes, categories=PM10_GRADE_LABELS)
+
+def _grouped_sums(codes, n_groups, y_true, y_pred):
+    """그룹 코드별 (개수, Σy, Σy², Σ오차², Σ|오차|) 합계"""
+    error = y_pred - y_true
+    return (
+        np.bincount(codes, minlength=n_groups),
+        np.bincount(codes, weights=y_true, minlength=n_groups),
+        np.bincount(codes, weights=y_true * y_true, minlength=n_groups),
+        np.bincount(codes, weights=error * error, minlength=n_groups),
+        np.bincount(codes, weights=np.abs(error), minlength=n_groups),
+    )
+
+def _metrics_from_sums(count, sum_y, sum_y2, sum_e2, sum_abs):
+    """합계로부터 (MSE, RMSE, MAE, R²) 배열 계산"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mse = sum_e2 / count
+        mae = sum_abs / count
+        ss_tot = sum_y2 - sum_y * sum_y / count
+        r2 = 1 - sum_e2 / ss_tot
+    r2 = np.where(ss_tot > 0, r2, np.nan)
+    return np.stack([mse, np.sqrt(mse), mae, r2], axis=-1)
+
+# 부트스트랩 워커가 공유하는 (그룹 정렬된) 배열
+_bootstrap_state = {}
+
+def _init_bootstrap_worker(codes, y_true, y_pred, n_groups):
+    """부트스트랩 워커 초기화: 배열을 워커마다 한 번만 전달"""
+    group_size = np.bincount(codes, minlength=n_groups)
+    group_start = np.concatenate([[0], np.cumsum(group_size)[:-1]])
+    _bootstrap_state.update(
+        codes=codes, y_true=y_true, y_pred=y_pred, n_groups=n_groups,
+        row_start=group_start[codes], row_size=group_size[codes],
+    )
+
+def _bootstrap_batch(args):
+    """워커: n_rep번의 그룹 내 복원 추출에 대한 그룹별 지표 (n_rep, n_groups, 4)"""
+    seed, n_rep = args
+    state = _bootstrap_state
+    codes, n_groups = state["codes"], state["n_groups"]
+    n_rows = len(codes)
+    rng = np.random.default_rng(seed)
+
+    # (반복 수 x 행 수) 인덱스 행렬: 각 행은 자기 그룹 구간 안에서 복원 추출
+    index = state["row_start"] + (rng.random((n_rep, n_rows)) * state["row_size"]).astype(np.int64)
+
+    # 반복마다 그룹 코드를 겹치지 않게 옮겨서 bincount 한 번으로 계산
+    offset_codes = (codes[None, :] + np.arange(n_rep)[:, None] * n_groups).ravel()
+    sums = _grouped_sums(
+        offset_codes, n_rep * n_groups,
+        state["y_true"][index].ravel(), state["y_pred"][index].ravel()
+    )
+    return _metrics_from_sums(*sums).reshape(n_rep, n_groups, len(METRIC_NAMES))
+
+def evaluate_grouped_regression(y_true, y_pred, groups, n_bootstrap=1000, ci=0.95, n_jobs=None, random_state=42):
+    """
+    전체 및 그룹별 MSE/RMSE/MAE/R²와 부트스트랩 신뢰구간을 계산합니다.
+
+    Parameters:
+        y_true (array-like): 실제 값
+        y_pred (array-like): 예측 값
+        groups (dict): {그룹기준 이름: y_true와 같은 길이의 그룹 값} (예: {"측정소명": ..., "month": ...})
+        n_bootstrap (int): 부트스트랩 반복 수 (0이면 신뢰구간 계산 생략)
+        ci (float): 신뢰수준 (기본값: 0.95)
+        n_jobs (int): 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        random_state (int): 난수 시드
+
+    Returns:
+        pd.DataFrame: 그룹기준, 그룹, metric, value, ci_lower, ci_upper, n 컬럼의 tidy 표
+                      (그룹기준 '전체'는 전체 데이터 지표)
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_pred = np.asarray(y_pred, dtype=np.float64)
+    n_rows = len(y_true)
+
+    # 그룹 기준마다 factorize 후 코드 공간을 이어 붙임 (첫 블록은 '전체')
+    block_codes = [np.zeros(n_rows, dtype=np.int64)]
+    labels = [("전체", "전체")]
+    offset = 1
+    for group_by, values in groups.items():
+        # 범주형(예: pm10등급)은 범주 순서, 그 외에는 값 순서로 정렬
+        codes, uniques = pd.factorize(pd.Series(values), sort=True)
+        if len(codes) != n_rows:
+            raise ValueError(f"그룹 값 길이가 y_true와 다릅니다: {group_by}")
+        codes = codes.astype(np.int64)
+        # 결측 그룹 값은 해당 그룹 기준 계산에서 제외 (코드 -1)
+        block_codes.append(np.where(codes >= 0, codes + offset, -1))
+        labels.extend((group_by, value) for value in uniques)
+        offset += len(uniques)
+    n_groups = offset
+
+    # 모든 그룹 기준을 한 배열로 쌓고 그룹 코드 순으로 정렬
+    stacked_codes = np.concatenate(block_codes)
+    stacked_rows = np.tile(np.arange(n_rows), len(block_codes))
+    keep = stacked_codes >= 0
+    stacked_codes, stacked_rows = stacked_codes[keep], stacked_rows[keep]
+    order = np.argsort(stacked_codes, kind="stable")
+    stacked_codes, stacked_rows = stacked_codes[order], stacked_rows[order]
+    stacked_true, stacked_pred = y_true[stacked_rows], y_pred[stacked_rows]
+
+    sums = _grouped_sums(stacked_codes, n_groups, stacked_true, stacked_pred)
+    point = _metrics_from_sums(*sums)
+    counts = sums[0]
+
+    lower = upper = np.full_like(point, np.nan)
+    if n_bootstrap:
+        batch_size = max(1, min(n_bootstrap, _MAX_BOOTSTRAP_CELLS // max(len(stacked_codes), 1)))
+        batches = [min(batch_size, n_bootstrap - start) for start in range(0, n_bootstrap, batch_size)]
+        seeds = np.random.SeedSequence(random_state).spawn(len(batches))
+        tasks = list(zip(seeds, batches))
+        init_args = (stacked_codes, stacked_true, stacked_pred, n_groups)
+
+        if n_jobs == 1 or len(tasks) == 1:
+            _init_bootstrap_worker(*init_args)
+            results = [_bootstrap_batch(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_bootstrap_worker, initargs=init_args) as executor:
+                results = list(executor.map(_bootstrap_batch, tasks))
+
+        replicates = np.concatenate(results, axis=0)
+        alpha = (1 - ci) / 2
+        # 행이 하나이거나 타깃이 상수인 그룹은 R²가 모든 반복에서 NaN → 'All-NaN slice' 경고 숨김
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            lower = np.nanquantile(replicates, alpha, axis=0)
+            upper = np.nanquantile(replicates, 1 - alpha, axis=0)
+
+    n_metrics = len(METRIC_NAMES)
+    report = pd.DataFrame({
+        "그룹기준": np.repeat([label[0] for label in labels], n_metrics),
+        "그룹": np.repeat(np.array([label[1] for label in labels], dtype=object), n_metrics),
+        "metric": np.tile(METRIC_NAMES, n_groups),
+        "value": point.ravel(),
+        "ci_lower": lower.ravel(),
+        "ci_upper": upper.ravel(),
+        "n": np.repeat(counts, n_metrics),
+    })
+    return report
+
+def evaluate_pm10_report(test_df, y_true, y_pred, group_columns=("측정소명", "month"), by_grade=True, **kwargs):
+    """
+    PM10 테스트 데이터에 대해 측정소별/월별/등급별 성능 리포트를 만듭니다.
+
+    Parameters:
+        test_df (pd.DataFrame): y_true와 같은 행 순서의 테스트 데이터 (group_columns 포함, 예: daycare_df.loc[X_test.index])
+        y_true (array-like): 실제 PM10
+        y_pred (array-like): 예측 PM10
+        group_columns (tuple): 그룹 기준 컬럼 (test_df에 없는 컬럼은 건너뜀)
+        by_grade (bool): True이면 실제 PM10 등급(좋음/보통/나쁨/매우 나쁨)별 지표 포함
+        **kwargs: evaluate_grouped_regression에 전달할 인자 (n_bootstrap, ci, n_jobs, random_state)
+
+    Returns:
+        pd.DataFrame: evaluate_grouped_regression 결과 표
+
+    사용 예:
+        report = evaluate_pm10_report(daycare_df.loc[X_test.index], y_test, y_pred_rf)
+        scores = report[(report["그룹기준"] == "측정소명") & (report["그룹"] == "강남구")]
+        plot_regression_metrics_bar(scores, "랜덤포레스트 (강남구)")
+    """
+    groups = {col: test_df[col].to_numpy() for col in group_columns if col in test_df.columns}
+    if by_grade:
+        groups["pm10등급"] = pm10_grade_band(y_true)
+    return evaluate_grouped_regression(y_true, y_pred, groups, **kwargs)
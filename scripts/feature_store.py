@@ -0,0 +1,235 @@
+"""
+모델 입력 특성/타깃을 메모리 맵 파일로 저장하고, 여러 프로세스에서 복사 없이 공유하기 위한 함수 모음.
+
+split_features_and_target이 반환한 X, y를 float32 연속 배열(.npy)로 한 번 저장해 두면,
+학습/교차검증/예측 워커는 같은 파일을 읽기 전용 메모리 맵으로 붙여(attach) 사용하므로
+워커 수가 늘어나도 데이터 사본이 늘어나지 않습니다.
+
+저장 구조 (store_dir/name 기준):
+    {name}_X.npy       : (행 수, 특성 수) float32, C-연속 배열
+    {name}_y.npy       : (행 수,) float32 배열
+    {name}_schema.json : 특성 컬럼명, 타깃 컬럼명, dtype, shape 정보
+"""
+
+import inspect
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.model_selection import KFold
+
+from scripts.model_utils import get_evaluate_regression_scores
+from scripts.utils import os, pd
+
+def _store_paths(store_dir, name):
+    """저장 파일 경로 (X, y, schema) 반환"""
+    return (
+        os.path.join(store_dir, f"{name}_X.npy"),
+        os.path.join(store_dir, f"{name}_y.npy"),
+        os.path.join(store_dir, f"{name}_schema.json"),
+    )
+
+def export_feature_matrix(X, y, store_dir, name="features", chunk_size=1_000_000):
+    """
+    특성 데이터프레임과 타깃 시리즈를 float32 메모리 맵 파일로 저장합니다.
+    청크 단위로 기록하므로 변환 과정에서 전체 float32 사본을 따로 만들지 않습니다.
+
+    Parameters:
+        X (pd.DataFrame): 모델 입력 특성 (예: split_features_and_target의 X)
+        y (pd.Series): 타깃 값 (예: split_features_and_target의 y)
+        store_dir (str): 저장할 디렉토리 경로
+        name (str): 저장 이름 (파일명 접두사, 기본값: 'features')
+        chunk_size (int): 한 번에 기록할 행 수
+
+    Returns:
+        dict: 저장된 스키마 정보
+    """
+    if len(X) != len(y):
+        raise ValueError(f"X와 y의 행 수가 다릅니다: {len(X)} != {len(y)}")
+
+    os.makedirs(store_dir, exist_ok=True)
+    x_path, y_path, schema_path = _store_paths(store_dir, name)
+
+    n_rows, n_features = X.shape
+    X_mm = np.lib.format.open_memmap(x_path, mode="w+", dtype=np.float32, shape=(n_rows, n_features))
+    y_mm = np.lib.format.open_memmap(y_path, mode="w+", dtype=np.float32, shape=(n_rows,))
+
+    for start in range(0, n_rows, chunk_size):
+        stop = min(start + chunk_size, n_rows)
+        X_mm[start:stop] = X.iloc[start:stop].to_numpy(dtype=np.float32)
+        y_mm[start:stop] = np.asarray(y.iloc[start:stop], dtype=np.float32)
+
+    X_mm.flush()
+    y_mm.flush()
+    del X_mm, y_mm
+
+    schema = {
+        "name": name,
+        "feature_columns": [str(col) for col in X.columns],
+        "target_column": str(y.name) if y.name is not None else None,
+        "dtype": "float32",
+        "n_rows": int(n_rows),
+        "n_features": int(n_features),
+    }
+    with open(schema_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, ensure_ascii=False, indent=2)
+
+    return schema
+
+def load_feature_schema(store_dir, name="features"):
+    """저장된 스키마(json)를 읽어 반환"""
+    _, _, schema_path = _store_paths(store_dir, name)
+    with open(schema_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def attach_feature_matrix(store_dir, name="features", as_frame=True):
+    """
+    저장된 특성/타깃 배열을 읽기 전용 메모리 맵으로 붙여 반환합니다. (데이터 복사 없음)
+
+    Parameters:
+        store_dir (str): 저장 디렉토리 경로
+        name (str): 저장 이름
+        as_frame (bool): True이면 컬럼명이 붙은 DataFrame/Series로, False이면 numpy 배열로 반환
+
+    Returns:
+        tuple: (X, y, schema)
+    """
+    x_path, y_path, _ = _store_paths(store_dir, name)
+    schema = load_feature_schema(store_dir, name)
+
+    X = np.load(x_path, mmap_mode="r")
+    y = np.load(y_path, mmap_mode="r")
+
+    if as_frame:
+        # 2차원 배열 하나로 만든 DataFrame은 원본 메모리 맵을 그대로 참조함
+        X = pd.DataFrame(X, columns=schema["feature_columns"], copy=False)
+        y = pd.Series(y, name=schema["target_column"], copy=False)
+
+    return X, y, schema
+
+def _accepts_sample_weight(fit_func):
+    """fit_func가 sample_weight 인자를 받는지 확인"""
+    return "sample_weight" in inspect.signature(fit_func).parameters
+
+def _outside_range(data, start, stop):
+    """[start, stop) 구간을 뺀 나머지 행 (구간이 양 끝이면 슬라이스 뷰)"""
+    if start == 0:
+        return data.iloc[stop:]
+    if stop >= len(data):
+        return data.iloc[:start]
+    return pd.concat([data.iloc[:start], data.iloc[stop:]])
+
+def _fit_and_score_fold(args):
+    """
+    워커: 메모리 맵을 붙인 뒤 한 fold를 학습/평가
+    test_idx가 (start, stop) 구간이면 연속 구간 fold, 배열이면 가중치 fold
+    """
+    store_dir, name, fit_func, fit_kwargs, test_idx = args
+    X, y, _ = attach_feature_matrix(store_dir, name, as_frame=True)
+
+    if isinstance(test_idx, tuple):
+        # 가중치를 받지 못하는 fit_func: 연속 구간 슬라이스(뷰)만 사용
+        start, stop = test_idx
+        model = fit_func(_outside_range(X, start, stop), _outside_range(y, start, stop), **fit_kwargs)
+        X_test, y_test = X.iloc[start:stop], y.iloc[start:stop]
+    else:
+        # 전체 메모리 맵으로 학습하고 테스트 fold 행은 가중치 0 (학습 데이터 사본 없음)
+        sample_weight = np.ones(len(y), dtype=np.float64)
+        sample_weight[test_idx] = 0.0
+        model = fit_func(X, y, sample_weight=sample_weight, **fit_kwargs)
+        X_test, y_test = X.iloc[test_idx], y.iloc[test_idx]
+
+    y_pred = model.predict(X_test)
+    return get_evaluate_regression_scores(y_test, y_pred)
+
+def cross_validate_from_store(store_dir, fit_func, name="features", n_splits=5, n_jobs=None, random_state=42, **fit_kwargs):
+    """
+    메모리 맵으로 저장된 특성 행렬을 이용해 K-Fold 교차검증을 여러 프로세스에서 병렬로 수행합니다.
+    워커에는 파일 경로와 테스트 fold 인덱스만 전달되고, 데이터는 각 워커가 메모리 맵으로 직접 붙습니다.
+
+    - fit_func가 sample_weight를 받으면: 섞은 KFold를 사용하고, 학습은 전체 메모리 맵에
+      테스트 fold 가중치 0을 주어 수행합니다. 학습 데이터 사본을 만들지 않으므로
+      워커 수가 늘어나도 메모리 사용량이 늘지 않습니다.
+      가중치 0인 행이 결과에 영향을 주지 않는 fit_func만 학습 fold 학습과 같은 결과를 냅니다.
+        * train_decision_tree: 가중치 0인 행은 분할 기준/리프 값에 기여하지 않음
+        * train_random_forest: 트리별 bootstrap을 가중치 > 0인 행(학습 fold)에서만 뽑음
+      (sklearn RandomForestRegressor를 그대로 sample_weight로 학습하는 fit_func는
+       bootstrap에 테스트 행이 섞이므로 사용하지 마세요.)
+    - sample_weight를 받지 않는 fit_func: 섞지 않은 연속 구간 fold를 사용합니다.
+      (처음/마지막 fold는 뷰로 학습하지만, 가운데 fold는 앞뒤 구간을 이어 붙이는 사본이 생깁니다.
+       저장 순서가 날짜 등으로 정렬되어 있으면 fold 간 분포가 다를 수 있습니다.)
+
+    Parameters:
+        store_dir (str): 저장 디렉토리 경로
+        fit_func (callable): (X_train, y_train, [sample_weight=...], **fit_kwargs)를 받아 학습된 모델을 반환하는 함수
+                             (예: train_random_forest, train_decision_tree)
+        name (str): 저장 이름
+        n_splits (int): fold 수 (기본값: 5)
+        n_jobs (int): 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        random_state (int): fold 분할 난수 시드 (가중치 fold에만 사용)
+        **fit_kwargs: fit_func에 전달할 추가 인자
+
+    Returns:
+        pd.DataFrame: fold별 MSE, RMSE, MAE, R² 점수
+    """
+    n_rows = load_feature_schema(store_dir, name)["n_rows"]
+
+    if _accepts_sample_weight(fit_func):
+        kfold = KFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        test_folds = [test_idx for _, test_idx in kfold.split(np.empty((n_rows, 0)))]
+    else:
+        kfold = KFold(n_splits=n_splits, shuffle=False)
+        test_folds = [(int(test_idx[0]), int(test_idx[-1]) + 1) for _, test_idx in kfold.split(np.empty((n_rows, 0)))]
+
+    tasks = [(store_dir, name, fit_func, fit_kwargs, test_idx) for test_idx in test_folds]
+
+    if n_jobs == 1:
+        scores = [_fit_and_score_fold(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            scores = list(executor.map(_fit_and_score_fold, tasks))
+
+    scores_df = pd.DataFrame(scores)
+    scores_df.index.name = "fold"
+    return scores_df
+
+# 예측 워커마다 한 번만 붙이는 모델/메모리 맵
+_worker_state = {}
+
+def _init_predict_worker(model, store_dir, name):
+    """예측 워커 초기화: 모델 보관 및 메모리 맵 attach"""
+    if hasattr(model, "n_jobs"):
+        model.set_params(n_jobs=1)
+    X, _, _ = attach_feature_matrix(store_dir, name, as_frame=True)
+    _worker_state["model"] = model
+    _worker_state["X"] = X
+
+def _predict_range(bounds):
+    """워커: [start, stop) 구간 예측"""
+    start, stop = bounds
+    return _worker_state["model"].predict(_worker_state["X"].iloc[start:stop])
+
+def predict_from_store(model, store_dir, name="features", chunk_size=200_000, n_jobs=None):
+    """
+    메모리 맵으로 저장된 특성 행렬 전체를 구간별로 나누어 병렬 예측합니다.
+    워커에는 행 구간만 전달되므로 특성 데이터가 프로세스 간에 복사되지 않습니다.
+
+    Parameters:
+        model: 학습된 회귀 모델
+        store_dir (str): 저장 디렉토리 경로
+        name (str): 저장 이름
+        chunk_size (int): 구간당 행 수
+        n_jobs (int): 워커 프로세스 수
+
+    Returns:
+        np.ndarray: 예측값 배열 (저장된 행 순서)
+    """
+    n_rows = load_feature_schema(store_dir, name)["n_rows"]
+    bounds = [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+    if not bounds:
+        return np.empty(0, dtype=np.float64)
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_predict_worker, initargs=(model, store_dir, name)) as executor:
+        results = list(executor.map(_predict_range, bounds))
+
+    return np.concatenate(results)
@@ -4,13 +4,13 @@ from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 
-def train_decision_tree(X_train, y_train, max_depth=4, random_state=42):
-    """의사결정트리 모델 학습"""
+def train_decision_tree(X_train, y_train, max_depth=4, random_state=42, sample_weight=None):
+    """의사결정트리 모델 학습 (sample_weight: 행별 가중치, 0인 행은 분할 기준/리프 값에 기여하지 않음)"""
     model = DecisionTreeRegressor(max_depth=max_depth, random_state=random_state)
-    model.fit(X_train, y_train)
+    model.fit(X_train, y_train, sample_weight=sample_weight)
     return model
 
-def train_random_forest(X_train, y_train, n_estimators=100, random_state=42):
+def train_random_forest(X_train, y_train, n_estimators=100, random_state=42, sample_weight=None):
     """랜덤포레스트 모델 학습
     
     Parameters:
@@ -18,18 +18,61 @@ def train_random_forest(X_train, y_train, n_estimators=100, random_state=42):
     - y_train: 학습 데이터의 타겟
     - n_estimators: 생성할 트리의 개수 (기본값: 100)
     - random_state: 랜덤 시드 (기본값: 42)
+    - sample_weight: 행별 가중치 (기본값: None)
+      지정하면 트리별 bootstrap 표본을 가중치가 0보다 큰 행에서만 직접 뽑습니다.
+      (sklearn 내부 bootstrap은 가중치 0인 행까지 포함한 전체 행에서 뽑으므로,
+       교차검증처럼 테스트 행을 가중치 0으로 둘 때 학습 fold만으로 학습한 것과 달라짐)
     """
+    if sample_weight is None:
+        model = RandomForestRegressor(
+            n_estimators=n_estimators, 
+            random_state=random_state
+        )
+        model.fit(X_train, y_train)
+        return model
+
+    sample_weight = np.asarray(sample_weight, dtype=np.float64)
+    rows = np.flatnonzero(sample_weight > 0)
+    n_rows = len(sample_weight)
+    rng = np.random.default_rng(random_state)
+
+    # 트리를 하나씩 추가하며(warm_start) 트리마다 bootstrap 횟수 x 가중치를 sample_weight로 전달
+    # (sklearn 내부 bootstrap과 같은 방식이지만, 추출 대상은 가중치 > 0인 행)
     model = RandomForestRegressor(
-        n_estimators=n_estimators, 
-        random_state=random_state
+        n_estimators=0, 
+        random_state=random_state,
+        bootstrap=False,
+        warm_start=True
     )
-    model.fit(X_train, y_train)
+    for i in range(1, n_estimators + 1):
+        counts = np.bincount(rows[rng.integers(0, len(rows), size=len(rows))], minlength=n_rows)
+        model.set_params(n_estimators=i)
+        model.fit(X_train, y_train, sample_weight=sample_weight * counts)
     return model
 
 def print_tree_rules(model, feature_names):
     """트리 규칙 텍스트 출력"""
     return export_text(model, feature_names=feature_names)
 
+def get_feature_columns(use_pm25=True):
+    """
+    모델 학습/예측에 사용하는 특성 컬럼 리스트를 반환합니다.
+
+    Parameters:
+    - use_pm25 (bool): True이면 pm25 포함, False이면 제외
+
+    Returns:
+    - list: 특성 컬럼명 리스트 (순서 고정)
+    """
+    # 공통 피처
+    feature_columns = ["평균기온(°C)", "일강수량(mm)", "평균 풍속(m/s)", "month"]
+
+    # pm25 포함 여부에 따라 컬럼 추가
+    if use_pm25:
+        feature_columns.insert(0, "pm25")
+
+    return feature_columns
+
 def split_features_and_target(df, target_column, use_pm25=True, test_size=0.2, random_state=42):
     """
     PM10 예측을 위한 특성과 타깃을 분리하고, 학습/테스트 세트로 분할합니다.
@@ -46,12 +89,7 @@ def split_features_and_target(df, target_column, use_pm25=True, test_size=0.2, r
     - y (pd.Series): 전체 타깃
     - X_train, X_test, y_train, y_test: 학습/테스트 분할된 데이터
     """
-    # 공통 피처
-    feature_columns = ["평균기온(°C)", "일강수량(mm)", "평균 풍속(m/s)", "month"]
-    
-    # pm25 포함 여부에 따라 컬럼 추가
-    if use_pm25:
-        feature_columns.insert(0, "pm25")
+    feature_columns = get_feature_columns(use_pm25)
 
     # 결측치 제거
     df_cleaned = df.dropna(subset=feature_columns + [target_column])
@@ -80,10 +118,7 @@ def predict_pm10(model, input_df, use_pm25=True):
     - '예측_PM10' 컬럼이 추가된 데이터프레임 반환
     """
     # 학습에 사용된 feature들 (순서 및 이름 일치 필수)
-    feature_columns = ["평균기온(°C)", "일강수량(mm)", "평균 풍속(m/s)", "month"]
-
-    if use_pm25:
-        feature_columns.insert(0, "pm25")
+    feature_columns = get_feature_columns(use_pm25)
 
     # 입력 데이터에서 필요한 피처 추출
     X = input_df[feature_columns]
@@ -0,0 +1,229 @@
+"""
+대기질/기상 데이터의 품질 검사(이상치 탐지) 함수 모음.
+
+모든 측정소 데이터를 (측정소, 날짜) 순으로 한 번 정렬한 뒤,
+측정소별 반복문 없이 배열 연산 한 번으로 아래 검사를 수행합니다.
+
+- 중복: 같은 측정소-날짜 행이 두 개 이상
+- 범위: 물리적으로 불가능한 값 (음수 농도/강수량, 비정상적인 기온/풍속 등)
+- pm25 > pm10: PM2.5는 PM10에 포함되므로 농도(µg/m³) 기준으로 PM10보다 클 수 없음
+- 급변(spike): 직전 window개 값의 평균/표준편차 기준 z-score가 임계값 초과
+- 고정값(flatline): 같은 값이 연속으로 flatline_run회 이상 반복
+
+검사 결과는 행마다 비트마스크(qc_flag)로 저장되며, 측정소별 요약 표를 함께 반환합니다.
+"""
+
+import numpy as np
+from scripts.utils import pd
+
+# 검사 항목별 비트 플래그
+FLAG_DUPLICATE = 1
+FLAG_OUT_OF_RANGE = 2
+FLAG_PM25_GT_PM10 = 4
+FLAG_SPIKE = 8
+FLAG_FLATLINE = 16
+
+FLAG_NAMES = {
+    FLAG_DUPLICATE: "중복",
+    FLAG_OUT_OF_RANGE: "범위초과",
+    FLAG_PM25_GT_PM10: "pm25>pm10",
+    FLAG_SPIKE: "급변",
+    FLAG_FLATLINE: "고정값",
+}
+
+# 컬럼별 허용 범위 (최솟값, 최댓값)
+DEFAULT_RANGE_LIMITS = {
+    "pm10": (0, 1000),
+    "pm25": (0, 500),
+    "평균기온(°C)": (-40, 45),
+    "일강수량(mm)": (0, 500),
+    "평균 풍속(m/s)": (0, 60),
+}
+
+def _group_starts(group_codes):
+    """정렬된 그룹 코드 배열에서 각 행이 속한 그룹의 시작 위치를 반환"""
+    n = len(group_codes)
+    is_start = np.ones(n, dtype=bool)
+    is_start[1:] = group_codes[1:] != group_codes[:-1]
+    start_positions = np.flatnonzero(is_start)
+    return start_positions[np.cumsum(is_start) - 1], is_start
+
+def rolling_zscore(values, row_group_start, window=30, min_periods=7):
+    """
+    그룹(측정소) 경계를 넘지 않는 직전 window개 값의 평균/표준편차로 z-score를 계산합니다.
+    누적합 배열을 이용하므로 그룹 수와 관계없이 배열 연산 한 번으로 처리됩니다.
+
+    Parameters:
+        values (np.ndarray): (측정소, 날짜) 순으로 정렬된 값 배열
+        row_group_start (np.ndarray): 각 행이 속한 그룹의 시작 위치
+        window (int): 비교할 직전 값 개수 (현재 값 제외)
+        min_periods (int): z-score를 계산하기 위한 최소 유효 값 개수
+
+    Returns:
+        np.ndarray: z-score 배열 (계산할 수 없으면 NaN)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+
+    # 앞에 0을 붙인 누적합: [s, e) 구간 합 = cs[e] - cs[s]
+    cs = np.concatenate([[0.0], np.cumsum(filled)])
+    cs2 = np.concatenate([[0.0], np.cumsum(filled * filled)])
+    cn = np.concatenate([[0], np.cumsum(valid)])
+
+    idx = np.arange(len(values))
+    window_start = np.maximum(idx - window, row_group_start)
+
+    n = cn[idx] - cn[window_start]
+    total = cs[idx] - cs[window_start]
+    total_sq = cs2[idx] - cs2[window_start]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / n
+        var = (total_sq - n * mean * mean) / (n - 1)
+        std = np.sqrt(np.maximum(var, 0.0))
+        z = (values - mean) / std
+
+    z[(n < min_periods) | ~valid | ~(std > 0)] = np.nan
+    return z
+
+def flatline_mask(values, is_group_start, min_run=5):
+    """
+    그룹(측정소) 안에서 같은 값이 min_run회 이상 연속된 행을 찾습니다.
+
+    Parameters:
+        values (np.ndarray): (측정소, 날짜) 순으로 정렬된 값 배열
+        is_group_start (np.ndarray): 그룹 첫 행이면 True
+        min_run (int): 고정값으로 판단할 최소 연속 횟수
+
+    Returns:
+        np.ndarray: 고정값 구간에 속하면 True인 불리언 배열
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+
+    # 그룹이 바뀌거나, 값이 바뀌거나, 결측이면 새 구간 시작
+    changed = is_group_start.copy()
+    changed[1:] |= values[1:] != values[:-1]
+    changed |= ~valid
+
+    run_id = np.cumsum(changed) - 1
+    run_length = np.bincount(run_id)[run_id]
+    return valid & (run_length >= min_run)
+
+def run_quality_checks(df, station_col="측정소명", date_col="date", range_limits=None,
+                       spike_columns=("pm10", "pm25"), flatline_columns=("pm10", "pm25"),
+                       window=30, z_threshold=4.0, min_periods=7, flatline_run=5):
+    """
+    모든 측정소 데이터에 대해 품질 검사를 한 번에 수행합니다.
+
+    Parameters:
+        df (pd.DataFrame): 검사할 데이터 (station_col, date_col 및 검사 대상 컬럼 포함)
+        station_col (str): 측정소명 컬럼명 (기본값: '측정소명')
+        date_col (str): 날짜 컬럼명 (기본값: 'date')
+        range_limits (dict): {컬럼명: (최솟값, 최댓값)} (기본값: DEFAULT_RANGE_LIMITS, 없는 컬럼은 건너뜀)
+        spike_columns (tuple): 급변 검사 대상 컬럼
+        flatline_columns (tuple): 고정값 검사 대상 컬럼
+        window (int): 급변 검사에 사용할 직전 값 개수
+        z_threshold (float): 급변으로 판단할 z-score 절댓값
+        min_periods (int): 급변 검사 최소 유효 값 개수
+        flatline_run (int): 고정값으로 판단할 최소 연속 횟수
+
+    Returns:
+        tuple:
+            - flags (pd.Series): 원본 행 순서의 uint8 비트마스크 (이름: 'qc_flag')
+            - summary (pd.DataFrame): 측정소별 전체 행 수, 검사 항목별 플래그 수, 플래그된 행 수
+    """
+    if range_limits is None:
+        range_limits = DEFAULT_RANGE_LIMITS
+
+    n_rows = len(df)
+    station_codes, station_names = pd.factorize(df[station_col], sort=True)
+    dates = pd.to_datetime(df[date_col]).to_numpy().astype("datetime64[D]").astype(np.int64)
+
+    # (측정소, 날짜) 순 정렬 → 같은 측정소 행이 연속된 배열 구조
+    order = np.lexsort((dates, station_codes))
+    sorted_codes = station_codes[order]
+    sorted_dates = dates[order]
+    row_group_start, is_group_start = _group_starts(sorted_codes)
+
+    def sorted_values(col):
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)[order]
+
+    flags = np.zeros(n_rows, dtype=np.uint8)
+
+    # 1. 중복: 정렬된 배열에서 이웃 행과 (측정소, 날짜)가 같으면 중복
+    same_as_prev = np.zeros(n_rows, dtype=bool)
+    same_as_prev[1:] = (sorted_codes[1:] == sorted_codes[:-1]) & (sorted_dates[1:] == sorted_dates[:-1])
+    duplicate = same_as_prev.copy()
+    duplicate[:-1] |= same_as_prev[1:]
+    flags[duplicate] |= FLAG_DUPLICATE
+
+    # 2. 범위
+    for col, (low, high) in range_limits.items():
+        if col not in df.columns:
+            continue
+        values = sorted_values(col)
+        flags[(values < low) | (values > high)] |= FLAG_OUT_OF_RANGE
+
+    # 3. pm25 > pm10
+    if "pm10" in df.columns and "pm25" in df.columns:
+        flags[sorted_values("pm25") > sorted_values("pm10")] |= FLAG_PM25_GT_PM10
+
+    # 4. 급변 (중복 행은 통계에서 제외하지 않음: 중복 플래그로 별도 확인)
+    for col in spike_columns:
+        if col not in df.columns:
+            continue
+        z = rolling_zscore(sorted_values(col), row_group_start, window=window, min_periods=min_periods)
+        flags[np.abs(z) > z_threshold] |= FLAG_SPIKE
+
+    # 5. 고정값
+    for col in flatline_columns:
+        if col not in df.columns:
+            continue
+        flags[flatline_mask(sorted_values(col), is_group_start, min_run=flatline_run)] |= FLAG_FLATLINE
+
+    # 원본 행 순서로 되돌림
+    original_flags = np.empty(n_rows, dtype=np.uint8)
+    original_flags[order] = flags
+    flags_series = pd.Series(original_flags, index=df.index, name="qc_flag")
+
+    summary = summarize_flags(flags, sorted_codes, station_names, station_col)
+    return flags_series, summary
+
+def summarize_flags(flags, station_codes, station_names, station_col="측정소명"):
+    """
+    비트마스크를 측정소별 검사 항목 개수 표로 요약합니다.
+
+    Parameters:
+        flags (np.ndarray): uint8 비트마스크
+        station_codes (np.ndarray): flags와 같은 순서의 측정소 코드 (factorize 결과, 결측은 -1)
+        station_names (array-like): 측정소 코드 → 측정소명
+        station_col (str): 요약 표의 인덱스 이름
+
+    Returns:
+        pd.DataFrame: 측정소별 '전체', 검사 항목별 개수, '플래그 행' 컬럼
+    """
+    valid = station_codes >= 0
+    codes = station_codes[valid]
+    flags = flags[valid]
+    n_stations = len(station_names)
+
+    summary = pd.DataFrame(index=pd.Index(station_names, name=station_col))
+    summary["전체"] = np.bincount(codes, minlength=n_stations)
+    for bit, name in FLAG_NAMES.items():
+        summary[name] = np.bincount(codes, weights=(flags & bit) > 0, minlength=n_stations).astype(np.int64)
+    summary["플래그 행"] = np.bincount(codes, weights=flags > 0, minlength=n_stations).astype(np.int64)
+    return summary
+
+def describe_flags(flag):
+    """
+    비트마스크 값을 검사 항목 이름 리스트로 변환합니다.
+
+    Parameters:
+        flag (int): qc_flag 값
+
+    Returns:
+        list: 해당하는 검사 항목 이름 리스트 (예: ['범위초과', '급변'])
+    """
+    return [name for bit, name in FLAG_NAMES.items() if int(flag) & bit]
@@ -0,0 +1,251 @@
+"""
+메모리에 한 번에 올릴 수 없는 큰 통합 데이터셋을 위한 스트리밍(out-of-core) 학습 함수 모음.
+
+- 저장된 CSV를 청크 단위로 읽고, 청크마다 결측치를 제거합니다.
+- 학습/테스트 분할은 측정소-날짜 키의 해시값으로 결정하므로
+  청크 크기나 읽는 순서와 관계없이 항상 같은 측정소-날짜가 같은 세트에 배정됩니다.
+- partial_fit을 지원하는 모델은 청크마다 점진적으로 학습하고,
+  트리 앙상블은 학습 세트에서 크기가 제한된 무작위(층화) 표본을 뽑아 학습합니다.
+- 평가는 기존 get_evaluate_regression_scores를 그대로 사용합니다.
+"""
+
+import numpy as np
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from scripts.model_utils import get_evaluate_regression_scores, get_feature_columns, train_random_forest
+from scripts.utils import pd
+
+# 해시값을 [0, 1) 구간으로 옮길 때 사용하는 버킷 수
+_HASH_BUCKETS = 1_000_000
+
+# 학습/테스트 분할 키: 같은 측정소-날짜의 어린이집 행은 특성과 타깃이 모두 같으므로
+# 어린이집 단위로 나누면 같은 값이 양쪽 세트에 들어감 (측정소-날짜 단위로 통째로 배정)
+SPLIT_KEY_COLUMNS = ("날짜", "측정소명")
+
+def iter_dataset_chunks(file_path, target_column="pm10", use_pm25=True, key_columns=SPLIT_KEY_COLUMNS, chunksize=500_000, extra_columns=()):
+    """
+    통합 데이터셋 CSV를 청크 단위로 읽어, 결측치를 제거한 청크를 순서대로 반환합니다.
+    'month' 컬럼이 없으면 '날짜' 컬럼에서 생성합니다.
+
+    Parameters:
+        file_path (str): 통합 데이터셋 CSV 경로 (예: daycare_air_quality_with_distance.csv)
+        target_column (str): 예측 대상 컬럼명 (기본값: 'pm10')
+        use_pm25 (bool): True이면 pm25 포함
+        key_columns (tuple): 학습/테스트 분할 해시에 사용할 키 컬럼
+        chunksize (int): 청크당 행 수
+        extra_columns (tuple): 함께 읽을 추가 컬럼 (예: 층화 기준 컬럼)
+
+    Yields:
+        pd.DataFrame: 키 컬럼, 특성 컬럼, 타깃 컬럼으로 구성된 청크
+    """
+    feature_columns = get_feature_columns(use_pm25)
+    header = pd.read_csv(file_path, nrows=0).columns
+    derive_month = "month" not in header
+
+    read_columns = list(dict.fromkeys(
+        [col for col in key_columns if col in header]
+        + [col for col in feature_columns if col != "month" or not derive_month]
+        + [target_column]
+        + list(extra_columns)
+        + (["날짜"] if derive_month else [])
+    ))
+
+    for chunk in pd.read_csv(file_path, usecols=read_columns, chunksize=chunksize, encoding="utf-8"):
+        if derive_month:
+            chunk["month"] = pd.to_datetime(chunk["날짜"]).dt.month
+
+        # 숫자형으로 변환 후 결측치 제거 (청크 내부에서만 수행)
+        numeric_columns = feature_columns + [target_column]
+        chunk[numeric_columns] = chunk[numeric_columns].apply(pd.to_numeric, errors="coerce")
+        chunk = chunk.dropna(subset=numeric_columns)
+
+        if not chunk.empty:
+            yield chunk
+
+def hash_test_mask(chunk, key_columns=SPLIT_KEY_COLUMNS, test_size=0.2, salt="dust"):
+    """
+    키 컬럼의 해시값으로 각 행의 테스트 세트 여부를 결정합니다. (결정적, 청크 독립적)
+
+    Parameters:
+        chunk (pd.DataFrame): 데이터 청크
+        key_columns (tuple): 해시에 사용할 키 컬럼 (청크에 없는 컬럼은 무시)
+        test_size (float): 테스트 세트 비율 (기본값: 0.2)
+        salt (str): 해시 키 (값을 바꾸면 다른 분할이 만들어짐)
+
+    Returns:
+        np.ndarray: 테스트 세트이면 True인 불리언 배열
+    """
+    key_columns = [col for col in key_columns if col in chunk.columns]
+    if not key_columns:
+        raise ValueError("해시 분할에 사용할 키 컬럼이 청크에 없습니다.")
+
+    hashed = pd.util.hash_pandas_object(chunk[key_columns].astype(str), index=False, hash_key=salt.ljust(16, "0")[:16])
+    buckets = hashed.to_numpy() % _HASH_BUCKETS
+    return buckets < int(test_size * _HASH_BUCKETS)
+
+def _split_chunk(chunk, feature_columns, target_column, key_columns, test_size, salt):
+    """청크를 해시 분할하여 (X_train, y_train, X_test, y_test) 반환"""
+    test_mask = hash_test_mask(chunk, key_columns, test_size, salt)
+    X = chunk[feature_columns]
+    y = chunk[target_column]
+    return X[~test_mask], y[~test_mask], X[test_mask], y[test_mask]
+
+def train_incremental(file_path, target_column="pm10", use_pm25=True, model=None, key_columns=SPLIT_KEY_COLUMNS,
+                      test_size=0.2, salt="dust", chunksize=500_000, n_epochs=1):
+    """
+    partial_fit을 지원하는 모델을 청크 단위로 점진 학습합니다.
+    특성 표준화(StandardScaler) 통계는 모델 학습 전에 별도의 첫 번째 읽기에서 계산합니다.
+
+    Parameters:
+        file_path (str): 통합 데이터셋 CSV 경로
+        target_column (str): 예측 대상 컬럼명
+        use_pm25 (bool): True이면 pm25 포함
+        model: partial_fit을 지원하는 회귀 모델 (기본값: SGDRegressor)
+        key_columns (tuple): 학습/테스트 분할 해시 키 컬럼
+        test_size (float): 테스트 세트 비율
+        salt (str): 해시 키
+        chunksize (int): 청크당 행 수
+        n_epochs (int): 전체 데이터 반복 횟수
+
+    Returns:
+        Pipeline: 학습된 (scaler, model) 파이프라인
+    """
+    if model is None:
+        model = SGDRegressor(random_state=42)
+    if not hasattr(model, "partial_fit"):
+        raise TypeError(f"{type(model).__name__}은(는) partial_fit을 지원하지 않습니다.")
+
+    feature_columns = get_feature_columns(use_pm25)
+
+    def iter_train_chunks():
+        for chunk in iter_dataset_chunks(file_path, target_column, use_pm25, key_columns, chunksize):
+            X_train, y_train, _, _ = _split_chunk(chunk, feature_columns, target_column, key_columns, test_size, salt)
+            if not X_train.empty:
+                yield X_train, y_train
+
+    # 1단계: 학습 세트 전체로 표준화 통계를 먼저 계산 (모델 학습 중에 스케일이 바뀌지 않도록)
+    scaler = StandardScaler()
+    for X_train, _ in iter_train_chunks():
+        scaler.partial_fit(X_train)
+    if not hasattr(scaler, "mean_"):
+        raise ValueError(f"학습에 사용할 행이 없습니다: {file_path}")
+
+    # 2단계: 고정된 스케일로 점진 학습
+    for _ in range(n_epochs):
+        for X_train, y_train in iter_train_chunks():
+            model.partial_fit(scaler.transform(X_train), y_train)
+
+    return Pipeline([("scaler", scaler), ("model", model)])
+
+def sample_training_rows(file_path, target_column="pm10", use_pm25=True, max_samples=500_000, stratify_column=None,
+                         key_columns=SPLIT_KEY_COLUMNS, test_size=0.2, salt="dust", chunksize=500_000, random_state=42):
+    """
+    학습 세트에서 최대 max_samples개 행을 균등 무작위로 추출합니다. (우선순위 키 기반 reservoir 샘플링)
+
+    각 행에 난수 우선순위를 부여하고, 현재 표본과 새 청크를 합쳐 우선순위가 가장 작은
+    행만 남기는 방식이므로 메모리 사용량은 max_samples + chunksize 행으로 제한됩니다.
+    stratify_column을 지정하면 그룹마다 같은 수(max_samples // 그룹 수)를 유지합니다.
+
+    Parameters:
+        file_path (str): 통합 데이터셋 CSV 경로
+        target_column (str): 예측 대상 컬럼명
+        use_pm25 (bool): True이면 pm25 포함
+        max_samples (int): 최대 표본 크기
+        stratify_column (str): 층화 기준 컬럼 (예: '측정소명', 기본값: None)
+        key_columns (tuple): 학습/테스트 분할 해시 키 컬럼
+        test_size (float): 테스트 세트 비율
+        salt (str): 해시 키
+        chunksize (int): 청크당 행 수
+        random_state (int): 난수 시드
+
+    Returns:
+        tuple: (X_sample, y_sample)
+    """
+    feature_columns = get_feature_columns(use_pm25)
+    extra_columns = (stratify_column,) if stratify_column else ()
+    keep_columns = list(dict.fromkeys(feature_columns + [target_column] + ([stratify_column] if stratify_column else [])))
+
+    rng = np.random.default_rng(random_state)
+    reservoir = None
+
+    for chunk in iter_dataset_chunks(file_path, target_column, use_pm25, key_columns, chunksize, extra_columns):
+        test_mask = hash_test_mask(chunk, key_columns, test_size, salt)
+        train_chunk = chunk.loc[~test_mask, keep_columns]
+        train_chunk = train_chunk.assign(_priority=rng.random(len(train_chunk)))
+
+        candidates = train_chunk if reservoir is None else pd.concat([reservoir, train_chunk], ignore_index=True)
+        candidates = candidates.sort_values("_priority", kind="stable")
+
+        if stratify_column is None:
+            reservoir = candidates.head(max_samples)
+        else:
+            n_groups = max(candidates[stratify_column].nunique(), 1)
+            reservoir = candidates.groupby(stratify_column, sort=False).head(max(max_samples // n_groups, 1))
+
+        reservoir = reservoir.reset_index(drop=True)
+
+    if reservoir is None:
+        raise ValueError(f"학습에 사용할 행이 없습니다: {file_path}")
+
+    return reservoir[feature_columns], reservoir[target_column]
+
+def train_forest_on_sample(file_path, target_column="pm10", use_pm25=True, max_samples=500_000, stratify_column=None,
+                           n_estimators=100, random_state=42, **sample_kwargs):
+    """
+    학습 세트의 무작위(층화) 표본으로 랜덤포레스트를 학습합니다.
+
+    Parameters:
+        file_path (str): 통합 데이터셋 CSV 경로
+        target_column (str): 예측 대상 컬럼명
+        use_pm25 (bool): True이면 pm25 포함
+        max_samples (int): 최대 표본 크기
+        stratify_column (str): 층화 기준 컬럼 (기본값: None)
+        n_estimators (int): 트리 개수
+        random_state (int): 난수 시드
+        **sample_kwargs: sample_training_rows에 전달할 추가 인자 (key_columns, test_size, salt, chunksize)
+
+    Returns:
+        RandomForestRegressor: 학습된 모델
+    """
+    X_sample, y_sample = sample_training_rows(
+        file_path, target_column, use_pm25, max_samples=max_samples,
+        stratify_column=stratify_column, random_state=random_state, **sample_kwargs
+    )
+    return train_random_forest(X_sample, y_sample, n_estimators=n_estimators, random_state=random_state)
+
+def evaluate_streaming(model, file_path, target_column="pm10", use_pm25=True, key_columns=SPLIT_KEY_COLUMNS,
+                       test_size=0.2, salt="dust", chunksize=500_000):
+    """
+    해시 분할의 테스트 세트 행만 청크 단위로 예측하고, get_evaluate_regression_scores로 평가합니다.
+    청크마다 실제값/예측값(float32)만 보관하므로 특성 데이터는 메모리에 누적되지 않습니다.
+
+    Parameters:
+        model: 학습된 회귀 모델
+        file_path (str): 통합 데이터셋 CSV 경로
+        target_column (str): 예측 대상 컬럼명
+        use_pm25 (bool): True이면 pm25 포함
+        key_columns (tuple): 학습/테스트 분할 해시 키 컬럼 (학습 시와 동일해야 함)
+        test_size (float): 테스트 세트 비율 (학습 시와 동일해야 함)
+        salt (str): 해시 키 (학습 시와 동일해야 함)
+        chunksize (int): 청크당 행 수
+
+    Returns:
+        dict: {"MSE": ..., "RMSE": ..., "MAE": ..., "R²": ...}
+    """
+    feature_columns = get_feature_columns(use_pm25)
+    y_true_parts = []
+    y_pred_parts = []
+
+    for chunk in iter_dataset_chunks(file_path, target_column, use_pm25, key_columns, chunksize):
+        _, _, X_test, y_test = _split_chunk(chunk, feature_columns, target_column, key_columns, test_size, salt)
+        if X_test.empty:
+            continue
+        y_true_parts.append(y_test.to_numpy(dtype=np.float32))
+        y_pred_parts.append(np.asarray(model.predict(X_test), dtype=np.float32))
+
+    if not y_true_parts:
+        raise ValueError(f"평가에 사용할 테스트 행이 없습니다: {file_path}")
+
+    return get_evaluate_regression_scores(np.concatenate(y_true_parts), np.concatenate(y_pred_parts))
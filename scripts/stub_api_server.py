@@ -0,0 +1,223 @@
+"""
+에어코리아/기상청 API를 흉내 내는 로컬 대체(stub) 서버.
+
+저장소의 원본 CSV(data/raw/air_quality/main, data/raw/weather)를 읽어
+async_fetcher가 요청하는 것과 같은 경로/파라미터/응답 형식(json)으로 돌려줍니다.
+인터넷 연결이나 인증키 없이 수집기를 테스트하고 벤치마크하는 용도입니다.
+
+- 응답 지연(latency), 일시적 오류 비율(failure_rate)을 지정해 재시도 동작을 확인할 수 있습니다.
+- 초당 요청 수(rate_limit)를 넘으면 429를 돌려줍니다.
+- nodata=True이면 실제 서비스처럼 관측값이 없는 구간(또는 없는 측정소)에 결과 코드 03(NODATA)을 돌려줍니다.
+
+사용 예 (프로젝트 루트에서 실행):
+    python -m scripts.stub_api_server --port 8080 --latency 0.05 --failure-rate 0.05
+"""
+
+import argparse
+import asyncio
+import glob
+import random
+import time
+
+from aiohttp import web
+
+from scripts.async_fetcher import AIRKOREA_PATH, KMA_PATH, RESULT_NODATA
+from scripts.utils import os, pd, strip_column_names
+
+DEFAULT_AIR_DIR = os.path.join("data", "raw", "air_quality", "main")
+DEFAULT_WEATHER_DIR = os.path.join("data", "raw", "weather")
+
+def _value_to_str(value):
+    """결측값은 빈 문자열, 나머지는 문자열로 변환 (공공데이터포털 응답 형식)"""
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def load_air_records(air_dir=DEFAULT_AIR_DIR):
+    """
+    원본 대기질 CSV를 측정소별 일평균 응답 item으로 변환합니다.
+
+    Returns:
+        dict: {측정소명: 날짜순 정렬된 DataFrame(msurDt 등 응답 필드 포함)}
+    """
+    records = {}
+    for file in sorted(glob.glob(os.path.join(air_dir, "*.csv"))):
+        station = os.path.splitext(os.path.basename(file))[0]
+        df = strip_column_names(pd.read_csv(file, skipinitialspace=True))
+        df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values("date").drop_duplicates("date").reset_index(drop=True)
+
+        records[station] = pd.DataFrame({
+            "dataDate": df["date"],
+            "msurDt": df["date"].dt.strftime("%Y-%m-%d"),
+            "msrstnName": station,
+            "pm10Value": df["pm10"].map(_value_to_str),
+            "pm25Value": df["pm25"].map(_value_to_str),
+            "o3Value": df["o3"].map(_value_to_str),
+            "no2Value": df["no2"].map(_value_to_str),
+            "so2Value": df["so2"].map(_value_to_str),
+            "coValue": df["co"].map(_value_to_str),
+        })
+    return records
+
+def load_weather_records(weather_dir=DEFAULT_WEATHER_DIR):
+    """
+    원본 기상 CSV(cp949)를 지점별 일자료 응답 item으로 변환합니다.
+
+    Returns:
+        dict: {지점번호(str): 날짜순 정렬된 DataFrame(tm 등 응답 필드 포함)}
+    """
+    frames = [
+        strip_column_names(pd.read_csv(file, encoding="cp949"))
+        for file in sorted(glob.glob(os.path.join(weather_dir, "*.csv")))
+    ]
+    if not frames:
+        return {}
+    df = pd.concat(frames, ignore_index=True)
+    df["일시"] = pd.to_datetime(df["일시"])
+
+    records = {}
+    for stn_id, group in df.groupby("지점", sort=True):
+        group = group.sort_values("일시").drop_duplicates("일시")
+        records[str(stn_id)] = pd.DataFrame({
+            "dataDate": group["일시"].to_numpy(),
+            "stnId": str(stn_id),
+            "stnNm": group["지점명"].to_numpy(),
+            "tm": group["일시"].dt.strftime("%Y-%m-%d").to_numpy(),
+            "avgTa": group["평균기온(°C)"].map(_value_to_str).to_numpy(),
+            "sumRn": group["일강수량(mm)"].map(_value_to_str).to_numpy(),
+            "avgWs": group["평균 풍속(m/s)"].map(_value_to_str).to_numpy(),
+        })
+    return records
+
+def _page(df, params, start_key, end_key):
+    """날짜 구간 필터링 후 pageNo/numOfRows로 잘라 (items, totalCount) 반환"""
+    start = pd.to_datetime(params.get(start_key), format="%Y%m%d")
+    end = pd.to_datetime(params.get(end_key), format="%Y%m%d")
+    # 정렬된 날짜 배열에서 구간 위치를 이진 탐색
+    lo = df["dataDate"].searchsorted(start, side="left")
+    hi = df["dataDate"].searchsorted(end, side="right")
+    selected = df.iloc[lo:hi].drop(columns="dataDate")
+
+    page_no = int(params.get("pageNo", 1))
+    num_rows = int(params.get("numOfRows", 10))
+    page_df = selected.iloc[(page_no - 1) * num_rows:page_no * num_rows]
+    return page_df.to_dict(orient="records"), len(selected)
+
+def _nodata_response():
+    """관측값이 없을 때의 공공데이터포털 응답 (body 없음)"""
+    return web.json_response({
+        "response": {"header": {"resultCode": RESULT_NODATA, "resultMsg": "NODATA_ERROR"}}
+    })
+
+def _response(items, total, page_no, num_rows, nested_items=False, nodata=False):
+    """공공데이터포털 형식의 json 응답 생성 (nodata=True이면 빈 결과를 NODATA 코드로 응답)"""
+    if nodata and total == 0:
+        return _nodata_response()
+    return web.json_response({
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "NORMAL_CODE"},
+            "body": {
+                "items": {"item": items} if nested_items else items,
+                "totalCount": total,
+                "pageNo": page_no,
+                "numOfRows": num_rows,
+            },
+        }
+    })
+
+def create_app(air_dir=DEFAULT_AIR_DIR, weather_dir=DEFAULT_WEATHER_DIR, latency=0.0, failure_rate=0.0, rate_limit=None, seed=42,
+               nodata=False):
+    """
+    대체 서버 aiohttp 애플리케이션을 생성합니다.
+
+    Parameters:
+        air_dir (str): 원본 대기질 CSV 폴더
+        weather_dir (str): 원본 기상 CSV 폴더
+        latency (float): 요청당 인위적 지연(초)
+        failure_rate (float): 503 응답을 돌려줄 확률 (0~1)
+        rate_limit (float): 초당 허용 요청 수 (초과 시 429, None이면 제한 없음)
+        seed (int): 오류 발생 난수 시드
+        nodata (bool): True이면 관측값이 없는 구간/측정소에 결과 코드 03(NODATA) 응답
+
+    Returns:
+        web.Application: 애플리케이션 객체
+    """
+    air_records = load_air_records(air_dir)
+    weather_records = load_weather_records(weather_dir)
+    rng = random.Random(seed)
+    window = {"start": time.monotonic(), "count": 0}
+
+    @web.middleware
+    async def chaos_middleware(request, handler):
+        # 초당 요청 수 제한 (1초 고정 구간)
+        if rate_limit is not None:
+            now = time.monotonic()
+            if now - window["start"] >= 1:
+                window["start"], window["count"] = now, 0
+            window["count"] += 1
+            if window["count"] > rate_limit:
+                return web.json_response({"message": "rate limited"}, status=429)
+        if latency:
+            await asyncio.sleep(latency)
+        if failure_rate and rng.random() < failure_rate:
+            return web.json_response({"message": "temporarily unavailable"}, status=503)
+        return await handler(request)
+
+    async def air_handler(request):
+        params = request.query
+        df = air_records.get(params.get("msrstnName"))
+        if df is None:
+            return _response([], 0, 1, int(params.get("numOfRows", 10)), nodata=nodata)
+        items, total = _page(df, params, "inqBginDt", "inqEndDt")
+        return _response(items, total, int(params.get("pageNo", 1)), int(params.get("numOfRows", 10)), nodata=nodata)
+
+    async def weather_handler(request):
+        params = request.query
+        df = weather_records.get(params.get("stnIds"))
+        if df is None:
+            return _response([], 0, 1, int(params.get("numOfRows", 10)), nested_items=True, nodata=nodata)
+        items, total = _page(df, params, "startDt", "endDt")
+        return _response(items, total, int(params.get("pageNo", 1)), int(params.get("numOfRows", 10)),
+                         nested_items=True, nodata=nodata)
+
+    app = web.Application(middlewares=[chaos_middleware])
+    app.router.add_get(AIRKOREA_PATH, air_handler)
+    app.router.add_get(KMA_PATH, weather_handler)
+    return app
+
+async def start_stub_server(host="127.0.0.1", port=8080, **app_kwargs):
+    """
+    대체 서버를 현재 이벤트 루프에서 시작합니다. (테스트/벤치마크용)
+
+    Returns:
+        web.AppRunner: 종료 시 `await runner.cleanup()` 호출
+    """
+    runner = web.AppRunner(create_app(**app_kwargs))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="에어코리아/기상청 API 로컬 대체 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--air-dir", default=DEFAULT_AIR_DIR)
+    parser.add_argument("--weather-dir", default=DEFAULT_WEATHER_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 지연(초)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="503 응답 확률 (0~1)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="초당 허용 요청 수")
+    parser.add_argument("--nodata", action="store_true", help="관측값이 없는 구간에 결과 코드 03(NODATA) 응답")
+    args = parser.parse_args(argv)
+
+    app = create_app(
+        air_dir=args.air_dir, weather_dir=args.weather_dir,
+        latency=args.latency, failure_rate=args.failure_rate, rate_limit=args.rate_limit,
+        nodata=args.nodata
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
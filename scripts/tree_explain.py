@@ -0,0 +1,197 @@
+"""
+의사결정트리/랜덤포레스트 예측값을 특성별 기여도로 분해하는 함수 모음. (Saabas 방식)
+
+예측값 = bias(루트 노드 평균) + Σ 특성별 기여도
+
+각 트리에서 자식 노드 값 - 부모 노드 값을 부모 노드의 분할 특성에 더하는 방식입니다.
+트리 노드 배열을 깊이 단위로 한 번 훑어 리프마다 루트→리프 경로의 누적 기여도 표(리프 x 특성)를
+미리 만들어 두고, model.apply(X)로 얻은 리프 번호(행 x 트리 정수)로 표를 모아 더합니다.
+decision_path처럼 (행 x 통과 노드) 지시 행렬을 만들지 않으므로 메모리는 행 수 x 트리 수 정수 배열과
+결과 행렬 정도만 사용하며, 파이썬 반복문으로 샘플마다 경로를 따라가지 않습니다.
+"""
+
+import numpy as np
+
+from scripts.bulk_scoring import dedup_feature_rows
+from scripts.model_utils import get_feature_columns
+from scripts.utils import os, pd, save_to_csv
+
+def _tree_leaf_contributions(tree, n_features, scale=1.0):
+    """
+    트리 하나의 리프별 누적 기여도 표와 루트 값을 계산합니다.
+
+    Returns:
+        tuple:
+            - leaf_row (np.ndarray): 노드 번호 → 표의 행 번호 (리프가 아니면 -1)
+            - leaf_table (np.ndarray): (리프 수 x 특성) 루트→리프 경로의 특성별 누적 기여도
+            - root_value (float): 루트 노드 값 (bias)
+    """
+    values = tree.value[:, 0, 0].astype(np.float64) * scale
+    left, right, feature = tree.children_left, tree.children_right, tree.feature
+
+    # 깊이 단위로 내려가며 자식 누적값 = 부모 누적값 + (자식 값 - 부모 값)을 부모의 분할 특성에 더함
+    cumulative = np.zeros((tree.node_count, n_features), dtype=np.float64)
+    frontier = np.array([0], dtype=np.int64)
+    while len(frontier):
+        parents = frontier[left[frontier] >= 0]
+        for children in (left[parents], right[parents]):
+            cumulative[children] = cumulative[parents]
+            cumulative[children, feature[parents]] += values[children] - values[parents]
+        frontier = np.concatenate([left[parents], right[parents]])
+
+    leaves = np.flatnonzero(left < 0)
+    leaf_row = np.full(tree.node_count, -1, dtype=np.int64)
+    leaf_row[leaves] = np.arange(len(leaves))
+    return leaf_row, cumulative[leaves], values[0]
+
+def build_leaf_contributions(model):
+    """
+    모델(DecisionTreeRegressor 또는 RandomForestRegressor)의 트리별 리프 누적 기여도 표를 만듭니다.
+    같은 모델로 여러 번 설명할 때는 결과를 재사용하면 됩니다.
+    (메모리: 전체 리프 수 x 특성 수 x 8바이트, 입력 행 수와 무관)
+
+    Parameters:
+        model: 학습된 트리 기반 회귀 모델
+
+    Returns:
+        tuple: (trees (트리별 (leaf_row, leaf_table) 리스트), bias (float))
+    """
+    n_features = model.n_features_in_
+
+    if hasattr(model, "estimators_"):
+        # 랜덤포레스트: 트리 평균이 되도록 1/트리 수로 스케일
+        scale = 1.0 / len(model.estimators_)
+        parts = [_tree_leaf_contributions(est.tree_, n_features, scale) for est in model.estimators_]
+    else:
+        parts = [_tree_leaf_contributions(model.tree_, n_features)]
+
+    trees = [(leaf_row, leaf_table) for leaf_row, leaf_table, _ in parts]
+    bias = float(sum(part[2] for part in parts))
+    return trees, bias
+
+def explain_predictions(model, X, contribution=None, chunk_size=20_000):
+    """
+    입력 배치의 예측값을 특성별 기여도로 분해합니다.
+    chunk_size 행씩 나누어 계산하므로 추가 메모리는 청크당 (행 수 x 트리 수) 리프 번호 배열로 제한됩니다.
+
+    Parameters:
+        model: 학습된 트리 기반 회귀 모델
+        X (pd.DataFrame): 모델 입력 특성 (학습 시와 같은 컬럼 순서)
+        contribution (tuple): build_leaf_contributions 결과 (None이면 새로 계산)
+        chunk_size (int): 한 번에 리프 번호를 구할 행 수
+
+    Returns:
+        pd.DataFrame: 특성별 기여도 컬럼 + 'bias' + '예측_PM10' (X와 같은 인덱스)
+    """
+    trees, bias = contribution if contribution is not None else build_leaf_contributions(model)
+    feature_names = list(getattr(model, "feature_names_in_", X.columns))
+
+    contributions = np.zeros((len(X), len(feature_names)), dtype=np.float64)
+    for start in range(0, len(X), chunk_size):
+        # (행 x 트리) 리프 노드 번호 (단일 트리는 1차원)
+        leaves = model.apply(X.iloc[start:start + chunk_size]).reshape(-1, len(trees))
+        block = contributions[start:start + len(leaves)]
+        for t, (leaf_row, leaf_table) in enumerate(trees):
+            block += leaf_table[leaf_row[leaves[:, t]]]
+
+    result_df = pd.DataFrame(contributions, columns=feature_names, index=X.index)
+    result_df["bias"] = bias
+    result_df["예측_PM10"] = bias + contributions.sum(axis=1)
+    return result_df
+
+def _explanation_columns(feature_columns):
+    """기여도 계산 결과로 추가되는 컬럼명"""
+    return [f"기여_{col}" for col in feature_columns] + ["bias", "예측_PM10"]
+
+def iter_pm10_explanations(model, input_df, use_pm25=True, key_columns=("측정소명", "날짜"), chunk_size=20_000, dedup=None):
+    """
+    입력 데이터를 측정소-날짜 단위로 중복 제거한 뒤, 청크 단위로 기여도를 계산해 순서대로 반환합니다.
+    각 청크 결과는 해당 청크에 속한 원본 행(어린이집 단위) 전체로 펼쳐집니다.
+    입력에 결과 컬럼과 같은 이름의 컬럼(예: '예측_PM10')이 있으면 새로 계산한 값으로 대체합니다.
+
+    Parameters:
+        model: 학습된 트리 기반 회귀 모델
+        input_df (pd.DataFrame): 예측 입력 데이터 (예: 어린이집-대기질-기상 통합 데이터)
+        use_pm25 (bool): True이면 pm25 포함 특성 사용
+        key_columns (tuple): 중복 제거 기준 키 컬럼
+        chunk_size (int): 한 번에 설명할 고유 특성 행 수
+        dedup (tuple): 이미 계산한 dedup_feature_rows 결과 (unique_df, inverse) (None이면 새로 계산)
+
+    Yields:
+        pd.DataFrame: 원본 컬럼 + 특성별 기여도('기여_' 접두사) + 'bias' + '예측_PM10'
+    """
+    feature_columns = get_feature_columns(use_pm25)
+    unique_df, inverse = dedup if dedup is not None else dedup_feature_rows(input_df, feature_columns, key_columns)
+    if len(unique_df) == 0:
+        return
+    contribution = build_leaf_contributions(model)
+    base_df = input_df.drop(columns=_explanation_columns(feature_columns), errors="ignore")
+
+    # 고유 행 번호 순으로 원본 행을 정렬해 두면 청크마다 연속 구간으로 잘라낼 수 있음
+    row_order = np.argsort(inverse, kind="stable")
+    bounds = np.searchsorted(inverse[row_order], np.arange(0, len(unique_df) + chunk_size, chunk_size))
+
+    for i, start in enumerate(range(0, len(unique_df), chunk_size)):
+        explained = explain_predictions(model, unique_df[feature_columns].iloc[start:start + chunk_size], contribution)
+        explained.columns = [f"기여_{col}" if col in feature_columns else col for col in explained.columns]
+
+        rows = row_order[bounds[i]:bounds[i + 1]]
+        chunk_df = base_df.iloc[rows].reset_index(drop=True)
+        broadcast = explained.iloc[inverse[rows] - start].reset_index(drop=True)
+        yield pd.concat([chunk_df, broadcast], axis=1)
+
+def explain_pm10(model, input_df, use_pm25=True, key_columns=("측정소명", "날짜"), chunk_size=20_000):
+    """
+    iter_pm10_explanations 결과를 하나의 데이터프레임으로 합쳐 원본 행 순서로 반환합니다.
+
+    Returns:
+        pd.DataFrame: 원본 컬럼 + 특성별 기여도 + 'bias' + '예측_PM10' (입력이 비어 있으면 같은 컬럼의 빈 데이터프레임)
+    """
+    feature_columns = get_feature_columns(use_pm25)
+    output_columns = _explanation_columns(feature_columns)
+    if input_df.empty:
+        base_columns = [col for col in input_df.columns if col not in output_columns]
+        return pd.DataFrame(columns=base_columns + output_columns)
+
+    # 중복 제거는 한 번만 계산해 생성기와 공유
+    dedup = dedup_feature_rows(input_df, feature_columns, key_columns)
+    row_order = np.argsort(dedup[1], kind="stable")
+
+    result_df = pd.concat(
+        list(iter_pm10_explanations(model, input_df, use_pm25, key_columns, chunk_size, dedup=dedup)),
+        ignore_index=True
+    )
+    # 청크 순서로 쌓인 결과를 원본 행 순서로 되돌림
+    original_order = np.empty_like(row_order)
+    original_order[row_order] = np.arange(len(row_order))
+    return result_df.iloc[original_order].reset_index(drop=True)
+
+def save_pm10_explanations(model, input_df, output_dir, file_name="pm10_explanations", use_pm25=True,
+                           key_columns=("측정소명", "날짜"), chunk_size=20_000):
+    """
+    기여도 계산 결과를 청크 단위로 CSV 파일에 이어 쓰며 저장합니다. (전체 결과를 메모리에 모으지 않음)
+
+    Parameters:
+        model: 학습된 트리 기반 회귀 모델
+        input_df (pd.DataFrame): 예측 입력 데이터
+        output_dir (str): 저장 디렉토리
+        file_name (str): 파일명 (확장자 제외)
+        use_pm25 (bool): True이면 pm25 포함 특성 사용
+        key_columns (tuple): 중복 제거 기준 키 컬럼
+        chunk_size (int): 한 번에 설명할 고유 특성 행 수
+
+    Returns:
+        int: 저장된 행 수
+    """
+    chunks = iter_pm10_explanations(model, input_df, use_pm25, key_columns, chunk_size)
+    n_rows = 0
+
+    for i, chunk_df in enumerate(chunks):
+        if i == 0:
+            # 첫 청크는 기존 저장 함수로 헤더와 함께 새로 작성
+            save_to_csv(chunk_df, output_dir=output_dir, file_name=file_name)
+        else:
+            chunk_df.to_csv(os.path.join(output_dir, f"{file_name}.csv"), mode="a", header=False, index=False, encoding="utf-8")
+        n_rows += len(chunk_df)
+
+    return n_rows
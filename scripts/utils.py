@@ -2,6 +2,33 @@ import os
 import matplotlib.pyplot as plt
 import platform
 import pandas as pd
+import numpy as np
+
+# 서울시 대기오염 측정소(자치구) 목록 — 정수 측정소코드는 이 리스트의 순서
+SEOUL_STATION_NAMES = [
+    '강남구', '강동구', '강북구', '강서구', '관악구', '광진구', '구로구', '금천구', '노원구',
+    '도봉구', '동대문구', '동작구', '마포구', '서대문구', '서초구', '성동구', '성북구', '송파구',
+    '양천구', '영등포구', '용산구', '은평구', '종로구', '중구', '중랑구'
+]
+
+# 기상청 지점명 중 자치구 이름과 다른 지점 → 측정소명
+# (강북* → 강북구, 현충원 → 동작구, 남현 → 관악구, 서울(종관기상관측, 종로 위치) → 종로구)
+KMA_STATION_ALIASES = {
+    '강북*': '강북구',
+    '현충원': '동작구',
+    '남현': '관악구',
+    '서울': '종로구',
+}
+
+# 측정소명/기상청 지점명 → 정수 측정소코드 공통 조회 테이블
+# '강남구'와 '강남'처럼 '구'를 뺀 이름, 기상청 별칭 모두 같은 코드로 매핑
+STATION_CODE_LOOKUP = {name: code for code, name in enumerate(SEOUL_STATION_NAMES)}
+STATION_CODE_LOOKUP.update({
+    name[:-1]: code for code, name in enumerate(SEOUL_STATION_NAMES) if name != '중구'
+})
+STATION_CODE_LOOKUP.update({
+    alias: STATION_CODE_LOOKUP[name] for alias, name in KMA_STATION_ALIASES.items()
+})
 
 def setup_font():
     """한글 폰트 설정 및 마이너스 기호 깨짐 방지"""
@@ -22,6 +49,25 @@ def setup_font():
     # 현재 설정된 폰트 확인
     print(f"Current font settings: {plt.rcParams['font.family']}")
 
+def to_station_codes(names):
+    """
+    측정소명/기상청 지점명을 정수 측정소코드로 변환하는 함수
+    고유값에 대해서만 조회 테이블을 찾고, 나머지는 범주 코드로 한 번에 펼칩니다.
+
+    Parameters:
+        names (array-like): 측정소명 또는 지점명
+
+    Returns:
+        np.ndarray: int16 측정소코드 배열 (조회 테이블에 없는 이름은 -1)
+    """
+    categorical = pd.Categorical(names)
+    category_codes = np.array(
+        [STATION_CODE_LOOKUP.get(str(name).strip(), -1) for name in categorical.categories] + [-1],
+        dtype=np.int16
+    )
+    # 결측값의 범주 코드 -1은 마지막 원소(-1)를 가리킴
+    return category_codes[categorical.codes]
+
 def sort_by_date(df, date_col="date", ascending=True):
     """날짜 기준으로 정렬"""
     df = df.sort_values(by=date_col, ascending=ascending)
@@ -1,13 +1,44 @@
 """
 결과 시각화를 위한 함수 모음.
+
+모든 그래프 함수는 save_path를 지정하면 화면에 띄우지 않고 파일로 저장합니다.
+여러 그래프를 한 번에 파일로 만들 때는 render_figures_batch를 사용합니다. (Agg 백엔드, 프로세스 병렬)
 """
 
+import contextlib
+import inspect
+import io
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
+from matplotlib.collections import PatchCollection
 from sklearn.tree import plot_tree
 
-def plot_feature_importance(model):
+from scripts.utils import os, setup_font
+
+def _show_or_save(save_path=None):
+    """
+    현재 figure를 화면에 출력하거나(save_path 없음), 파일로 저장한 뒤 닫습니다.
+
+    Parameters:
+        save_path (str | list): 저장 경로 또는 경로 리스트 (확장자로 형식 결정, 예: .png, .svg)
+    """
+    if save_path is None:
+        plt.show()
+        return
+
+    fig = plt.gcf()
+    paths = [save_path] if isinstance(save_path, str) else list(save_path)
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fig.savefig(path, bbox_inches="tight")
+    plt.close(fig)
+
+def plot_feature_importance(model, save_path=None):
     """특성 중요도 시각화"""
     importances = model.feature_importances_
     names = model.feature_names_in_
@@ -16,16 +47,16 @@ def plot_feature_importance(model):
     plt.title("Feature Importance")
     plt.grid(True)
     plt.tight_layout()
-    plt.show()
+    _show_or_save(save_path)
 
-def plot_decision_tree(model, feature_names, max_depth=3):
+def plot_decision_tree(model, feature_names, max_depth=3, save_path=None):
     """의사결정트리 시각화"""
     plt.figure(figsize=(15, 10))
     plot_tree(model, feature_names=feature_names, filled=True, fontsize=10, max_depth=max_depth)
     plt.tight_layout()
-    plt.show()
+    _show_or_save(save_path)
 
-def plot_nearby_daycares_outside_district(daycare_df, monitoring_station_df, station_name, radius_km=3):
+def plot_nearby_daycares_outside_district(daycare_df, monitoring_station_df, station_name, radius_km=3, save_path=None):
     """
     특정 측정소를 중심으로 반경 내에 존재하지만, 다른 자치구에 속한 어린이집들을 시각화하는 함수입니다.
 
@@ -34,6 +65,7 @@ def plot_nearby_daycares_outside_district(daycare_df, monitoring_station_df, sta
         monitoring_station_df (pd.DataFrame): 대기오염 측정소 위치 정보
         station_name (str): 분석하고자 하는 기준 측정소 이름
         radius_km (float): 반경 거리 (기본값 3km)
+        save_path (str | list): 지정하면 화면 대신 파일로 저장 (기본값 None)
     """
 
     # 기준 측정소 위치 및 자치구 정보 추출
@@ -62,11 +94,8 @@ def plot_nearby_daycares_outside_district(daycare_df, monitoring_station_df, sta
         )
 
         # 어린이집 옆에 자치구 이름 표시
-        for _, row in district_df.iterrows():
-            ax.text(
-                row["경도"] + 0.0005, row["위도"] + 0.0005,
-                row["어린이집 위치"], fontsize=7, color="gray"
-            )
+        for lon, lat in zip(district_df["경도"].to_numpy(), district_df["위도"].to_numpy()):
+            ax.text(lon + 0.0005, lat + 0.0005, district, fontsize=7, color="gray")
 
     # 기준 측정소 위치 마커(X)로 표시
     ax.scatter(target_lon, target_lat, color="black", marker="X", s=100, label=f"{station_name} 측정소")
@@ -86,9 +115,9 @@ def plot_nearby_daycares_outside_district(daycare_df, monitoring_station_df, sta
     ax.grid(True)
     ax.legend(title="어린이집 자치구", loc="upper right")
     plt.tight_layout()
-    plt.show()
+    _show_or_save(save_path)
 
-def draw_monthly_pm10_subplot(data_df, monitoring_station_df, start_month, end_month, radius_km=3):
+def draw_monthly_pm10_subplot(data_df, monitoring_station_df, start_month, end_month, radius_km=3, save_path=None):
     """
     여러 달(month)의 PM10 농도를 시각화하는 함수입니다.
     각 월에 대해, 서울 측정소 반경 radius_km 이내에 위치한 어린이집의 PM10 값을 지도 위에 산점도로 표시합니다.
@@ -99,10 +128,17 @@ def draw_monthly_pm10_subplot(data_df, monitoring_station_df, start_month, end_m
         start_month (int): 시각화할 시작 월
         end_month (int): 시각화할 마지막 월
         radius_km (float): 측정소 반경 (기본값 3km)
+        save_path (str | list): 지정하면 화면 대신 파일로 저장 (기본값 None)
     """
     
     # 서울 측정소만 필터링
     seoul_stations = monitoring_station_df[monitoring_station_df["지역명"] == "서울"]
+    station_names = seoul_stations["측정소명"].to_numpy()
+    station_lats = seoul_stations["위도"].to_numpy(dtype=float)
+    station_lons = seoul_stations["경도"].to_numpy(dtype=float)
+
+    # 반경 내 PM10 데이터는 월과 관계없이 한 번만 필터링
+    in_radius = data_df[(data_df["측정소까지거리(km)"] <= radius_km) & (data_df["pm10"].notna())]
 
     month_range = range(start_month, end_month + 1)
     n_months = len(month_range)
@@ -122,35 +158,26 @@ def draw_monthly_pm10_subplot(data_df, monitoring_station_df, start_month, end_m
         ax = axes[i]
 
         # 해당 월에 해당하는 데이터만 필터링
-        subset = data_df[
-            (data_df["측정소까지거리(km)"] <= radius_km) &
-            (data_df["pm10"].notna()) &
-            (data_df["month"] == month)
-        ]
+        subset = in_radius[in_radius["month"] == month]
 
         # 어린이집 위치 산점도로 표시 (PM10 값을 색상으로 표현)
+        # 점이 많으므로 벡터 형식(svg 등)으로 저장할 때도 이 레이어만 래스터로 저장
         scatter = ax.scatter(
             subset["경도"], subset["위도"],
             c=subset["pm10"], cmap="YlOrRd", s=20, alpha=0.7,
-            vmin=0, vmax=60
+            vmin=0, vmax=60, rasterized=True
         )
 
-        # 각 측정소에 대해 위치와 이름, 반경 원 그리기
-        for _, station in seoul_stations.iterrows():
-            name = station["측정소명"]
-            lat = station["위도"]
-            lon = station["경도"]
-
-            # 측정소 위치 마커(X) 표시
-            ax.scatter(lon, lat, marker="X", color="black", s=60)
+        # 모든 측정소 위치 마커(X)를 하나의 scatter로 표시
+        ax.scatter(station_lons, station_lats, marker="X", color="black", s=60)
+        for name, lat, lon in zip(station_names, station_lats, station_lons):
             ax.text(lon + 0.002, lat + 0.002, name, fontsize=8, color="black")
 
-            # 반경 km 내 원 그리기 (위도 1도 ≈ 111km)
-            circle = plt.Circle(
-                (lon, lat), radius_km / 111,
-                color='gray', fill=False, linestyle='--', alpha=0.3
-            )
-            ax.add_patch(circle)
+        # 반경 km 내 원을 하나의 PatchCollection으로 그리기 (위도 1도 ≈ 111km)
+        circles = [plt.Circle((lon, lat), radius_km / 111) for lat, lon in zip(station_lats, station_lons)]
+        ax.add_collection(PatchCollection(
+            circles, facecolor='none', edgecolor='gray', linestyle='--', alpha=0.3
+        ))
 
         # 서브플롯 제목 및 설정
         ax.set_title(f"{month}월", fontsize=12)
@@ -175,9 +202,9 @@ def draw_monthly_pm10_subplot(data_df, monitoring_station_df, start_month, end_m
     )
 
     # 최종 시각화 출력
-    plt.show()
+    _show_or_save(save_path)
 
-def plot_bad_pm10_heatmap(data_df):
+def plot_bad_pm10_heatmap(data_df, save_path=None):
     """
     PM10 '나쁨' 등급의 측정소-월별 분포를 히트맵으로 시각화합니다.
 
@@ -230,9 +257,9 @@ def plot_bad_pm10_heatmap(data_df):
     plt.title("측정소별 월별 PM10 '나쁨' 일수 분포")
     plt.xlabel("월")
     plt.ylabel("측정소기준 구역")
-    plt.show()
+    _show_or_save(save_path)
 
-def plot_pm10_prediction_timeseries(model, X_test, y_test, y_pred, title):
+def plot_pm10_prediction_timeseries(model, X_test, y_test, y_pred, title, save_path=None):
     """
     회귀 모델의 PM10 예측 결과를 시계열 형태로 시각화하는 함수입니다.
 
@@ -246,6 +273,7 @@ def plot_pm10_prediction_timeseries(model, X_test, y_test, y_pred, title):
         X_test: 테스트용 특성 데이터프레임
         y_test: 테스트용 실제 PM10 값 (시리즈)
         title: 그래프 제목 (str)
+        save_path: 지정하면 화면 대신 파일로 저장 (str 또는 list, 기본값 None)
     """
 
     # y_test의 인덱스를 기준으로 정렬하여 시계열 순서 유지
@@ -267,9 +295,9 @@ def plot_pm10_prediction_timeseries(model, X_test, y_test, y_pred, title):
     plt.ylabel("PM10")
     plt.legend()
     plt.tight_layout()
-    plt.show()
+    _show_or_save(save_path)
 
-def plot_scatter_prediction(y_true, y_pred, title="예측 결과"):
+def plot_scatter_prediction(y_true, y_pred, title="예측 결과", save_path=None):
     """
     실제값과 예측값의 산점도를 그려 예측 성능을 직관적으로 확인하는 함수입니다.
     대각선(이상적 예측선)도 함께 표시하여 예측이 얼마나 실제값과 일치하는지 시각적으로 보여줍니다.
@@ -286,26 +314,138 @@ def plot_scatter_prediction(y_true, y_pred, title="예측 결과"):
     plt.title(title)
     plt.grid(True)
     plt.tight_layout()
-    plt.show()
+    _show_or_save(save_path)
 
-def plot_regression_metrics_bar(scores: dict, model_name: str):
+def plot_regression_metrics_bar(scores, model_name: str, save_path=None):
     """
     회귀 모델의 성능 지표(MSE, RMSE, MAE, R²)를 막대그래프로 시각화하는 함수입니다.
 
     Parameters:
-        scores (dict): {"MSE": ..., "RMSE": ..., "MAE": ..., "R²": ...} 형식의 성능 지표 딕셔너리
+        scores (dict | pd.DataFrame): {"MSE": ..., "RMSE": ..., "MAE": ..., "R²": ...} 형식의 성능 지표 딕셔너리,
+                                      또는 evaluate_grouped_regression 결과 중 한 그룹의 행
+                                      (metric, value 컬럼, ci_lower/ci_upper가 있으면 신뢰구간 오차 막대 표시)
         model_name (str): 모델 이름 (그래프 제목에 사용)
+        save_path (str | list): 지정하면 화면 대신 파일로 저장 (기본값 None)
     """
+    intervals = None
+    if isinstance(scores, pd.DataFrame):
+        if scores["metric"].duplicated().any():
+            raise ValueError("한 그룹의 지표 행만 전달해야 합니다. (그룹기준, 그룹으로 먼저 필터링)")
+        if {"ci_lower", "ci_upper"} <= set(scores.columns) and scores[["ci_lower", "ci_upper"]].notna().any().any():
+            intervals = scores[["ci_lower", "ci_upper"]].to_numpy(dtype=float)
+        scores = dict(zip(scores["metric"], scores["value"]))
+
     print(f"\n{model_name} 성능 지표")
-    for metric, value in scores.items():
-        print(f" - {metric}: {value:.4f}")  # 소수점 4자리로 출력
+    for i, (metric, value) in enumerate(scores.items()):
+        if intervals is None:
+            print(f" - {metric}: {value:.4f}")  # 소수점 4자리로 출력
+        else:
+            print(f" - {metric}: {value:.4f} [{intervals[i, 0]:.4f}, {intervals[i, 1]:.4f}]")
 
     # 성능 지표를 막대그래프로 시각화
     plt.figure(figsize=(8, 5))
-    sns.barplot(x = scores.keys(), y = scores.values())
+    sns.barplot(x = list(scores.keys()), y = list(scores.values()))
+    top = max(scores.values())
+    if intervals is not None:
+        values = np.array(list(scores.values()), dtype=float)
+        errors = np.abs(intervals - values[:, None]).T
+        plt.errorbar(range(len(values)), values, yerr=errors, fmt="none", ecolor="black", capsize=4)
+        top = max(top, np.nanmax(intervals[:, 1]))
     plt.title(f"{model_name} 성능 지표")
     plt.ylabel("값")
-    plt.ylim(0, max(scores.values()) * 1.2)
+    plt.ylim(0, top * 1.2)
     plt.grid(axis="y", linestyle="--", alpha=0.4)
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    _show_or_save(save_path)
+
+# render_figures_batch에서 사용할 수 있는 그래프 함수 (모두 save_path 인자를 받음)
+BATCH_PLOT_FUNCTIONS = {
+    func.__name__: func
+    for func in (
+        plot_feature_importance,
+        plot_decision_tree,
+        plot_nearby_daycares_outside_district,
+        draw_monthly_pm10_subplot,
+        plot_bad_pm10_heatmap,
+        plot_pm10_prediction_timeseries,
+        plot_scatter_prediction,
+        plot_regression_metrics_bar,
+    )
+}
+
+# 공유 인자 이름이 함수 인자 이름과 다른 경우: {함수 이름: {함수 인자: 공유 인자}}
+_SHARED_KWARG_ALIASES = {
+    "plot_nearby_daycares_outside_district": {"daycare_df": "data_df"},
+}
+
+# 배치 렌더링 워커에서 모든 작업이 공유하는 인자 (워커마다 한 번만 전달)
+_shared_render_kwargs = {}
+
+def _init_render_worker(shared_kwargs):
+    """렌더링 워커 초기화: 화면 없는 Agg 백엔드, 한글 폰트, 공유 인자 설정"""
+    matplotlib.use("Agg")
+    # 워커마다 폰트 설정 메시지가 출력되지 않도록 표준 출력 숨김
+    with contextlib.redirect_stdout(io.StringIO()):
+        setup_font()
+    _shared_render_kwargs.clear()
+    _shared_render_kwargs.update(shared_kwargs or {})
+
+def _render_job(job, output_dir, formats, dpi):
+    """워커: 그래프 함수 하나를 실행해 지정한 형식들로 저장"""
+    func = BATCH_PLOT_FUNCTIONS[job["func"]]
+    # 공유 인자 중 해당 함수가 받는 인자만 전달 (이름이 다른 인자는 _SHARED_KWARG_ALIASES로 연결)
+    aliases = _SHARED_KWARG_ALIASES.get(job["func"], {})
+    shared = {}
+    for param in inspect.signature(func).parameters:
+        key = aliases.get(param, param)
+        if key in _shared_render_kwargs:
+            shared[param] = _shared_render_kwargs[key]
+    kwargs = {**shared, **job.get("kwargs", {})}
+    paths = [os.path.join(output_dir, f"{job['name']}.{fmt}") for fmt in formats]
+
+    plt.rcParams["savefig.dpi"] = dpi
+    func(**kwargs, save_path=paths)
+    return paths
+
+def _render_job_star(args):
+    return _render_job(*args)
+
+def render_figures_batch(jobs, output_dir, shared_kwargs=None, formats=("png", "svg"), n_jobs=None, dpi=150):
+    """
+    여러 그래프를 화면 출력 없이(Agg 백엔드) 파일로 저장합니다. 서로 독립적인 그래프는 프로세스 풀에서 병렬로 그립니다.
+
+    Parameters:
+        jobs (list): 작업 리스트. 각 작업은 dict
+                     - "func" (str): BATCH_PLOT_FUNCTIONS에 있는 그래프 함수 이름 (예: "draw_monthly_pm10_subplot")
+                     - "name" (str): 저장 파일명 (확장자 제외)
+                     - "kwargs" (dict): 함수 인자 (shared_kwargs보다 우선)
+        output_dir (str): 저장 디렉토리
+        shared_kwargs (dict): 모든 작업에 공통으로 넘길 인자 (예: data_df, monitoring_station_df)
+                              워커 초기화 시 한 번만 전달되므로 큰 데이터프레임은 여기에 넣습니다.
+                              각 함수에는 그 함수가 받는 인자만 전달됩니다.
+                              (plot_nearby_daycares_outside_district의 daycare_df에는 data_df가 전달됨)
+        formats (tuple): 저장 형식 (기본값: png, svg)
+        n_jobs (int): 워커 프로세스 수 (None이면 CPU 수)
+        dpi (int): 래스터 이미지 해상도
+
+    Returns:
+        list: 작업별 저장된 파일 경로 리스트
+
+    사용 예:
+        jobs = [
+            {"func": "draw_monthly_pm10_subplot", "name": f"pm10_{s}_{e}_r{r}",
+             "kwargs": {"start_month": s, "end_month": e, "radius_km": r}}
+            for s, e in [(1, 6), (7, 12)] for r in [1, 2, 3]
+        ]
+        render_figures_batch(jobs, "../reports/figures",
+                             shared_kwargs={"data_df": daycare_df, "monitoring_station_df": monitoring_station_df})
+    """
+    for job in jobs:
+        if job["func"] not in BATCH_PLOT_FUNCTIONS:
+            raise ValueError(f"알 수 없는 그래프 함수입니다: {job['func']}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(job, output_dir, tuple(formats), dpi) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_render_worker, initargs=(shared_kwargs,)) as executor:
+        return list(executor.map(_render_job_star, tasks))
@@ -0,0 +1,167 @@
+import glob
+import pickle
+import numpy as np
+from scripts.utils import os, pd, SEOUL_STATION_NAMES, strip_column_names, to_station_codes
+
+# 기상청 일자료 원본에서 사용하는 컬럼과 dtype
+WEATHER_VALUE_COLUMNS = ['평균기온(°C)', '일강수량(mm)', '평균 풍속(m/s)']
+WEATHER_RAW_DTYPES = {
+    '지점명': 'category',
+    '평균기온(°C)': 'float32',
+    '일강수량(mm)': 'float32',
+    '평균 풍속(m/s)': 'float32',
+}
+
+def read_kma_daily_weather(file_path, encoding='cp949'):
+    """
+    기상청(KMA) 일자료 CSV를 한 번의 파싱으로 필요한 컬럼만 타입을 지정해 읽는 함수
+
+    Parameters:
+        file_path (str): 기상청 일자료 CSV 경로 (예: '../data/raw/weather/Seoul_daily_weather_2018_2024.csv')
+        encoding (str): 파일 인코딩 (기본값: 'cp949')
+
+    Returns:
+        pd.DataFrame: 지점명(category), 일시(datetime64), 평균기온/일강수량/평균 풍속(float32) 컬럼
+    """
+    keep = {'지점명', '일시', *WEATHER_VALUE_COLUMNS}
+
+    df = pd.read_csv(
+        file_path,
+        encoding=encoding,
+        # 열 이름 앞뒤 공백이 있어도 선택되도록 정리한 이름으로 비교
+        usecols=lambda col: col.strip() in keep,
+        dtype={col: dtype for col, dtype in WEATHER_RAW_DTYPES.items()},
+        parse_dates=['일시'],
+        date_format='%Y-%m-%d',
+    )
+    return strip_column_names(df)
+
+def _source_signature(file_paths):
+    """원본 파일 경로/크기/수정시각으로 캐시 유효성 확인용 서명 생성"""
+    return [
+        (os.path.abspath(path), os.path.getsize(path), os.path.getmtime(path))
+        for path in sorted(file_paths)
+    ]
+
+def preprocess_weather_data(file_paths=None, folder_path='../data/raw/weather', cache_path=None):
+    """
+    기상청 일자료 원본 파일들을 읽어 정수 측정소코드 기준으로 정규화하는 함수
+
+    - 지점명은 공통 조회 테이블(STATION_CODE_LOOKUP)로 측정소코드(int16)에 매핑합니다.
+      (강북* → 강북구, 현충원 → 동작구, 남현 → 관악구, 서울 → 종로구 포함)
+    - 자치구에 대응하지 않는 지점(기상청, 한강, 북악산 등)은 제외합니다.
+    - 같은 측정소에 지점이 둘 이상인 날(예: 관악, 남현)은 평균값을 사용해 측정소-날짜당 한 행만 남깁니다.
+    - cache_path를 지정하면 결과를 저장해 두고, 원본 파일이 바뀌지 않았으면 캐시를 바로 반환합니다.
+
+    Parameters:
+        file_paths (list): 원본 CSV 경로 리스트 (기본값: None, folder_path의 모든 CSV)
+        folder_path (str): 원본 CSV 폴더 경로
+        cache_path (str): 정규화 결과 캐시(pickle) 경로 (기본값: None, 캐시 사용 안 함)
+
+    Returns:
+        pd.DataFrame: 측정소코드, 측정소명, 날짜, 평균기온(°C), 일강수량(mm), 평균 풍속(m/s)
+                      (측정소코드, 날짜 기준 정렬)
+    """
+    if file_paths is None:
+        file_paths = sorted(glob.glob(os.path.join(folder_path, '*.csv')))
+    signature = _source_signature(file_paths)
+
+    # 캐시 확인
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('signature') == signature:
+            return cached['data']
+
+    df = pd.concat([read_kma_daily_weather(path) for path in file_paths], ignore_index=True)
+
+    # 지점명 → 측정소코드 (매핑되지 않는 지점 제외)
+    codes = to_station_codes(df['지점명'])
+    valid = codes >= 0
+    codes = codes[valid]
+    dates = df['일시'].to_numpy()[valid].astype('datetime64[D]')
+    values = df[WEATHER_VALUE_COLUMNS].to_numpy(dtype=np.float64)[valid]
+
+    # (측정소코드, 날짜) 정렬 후 같은 키끼리 평균
+    keys = station_date_keys(codes, dates)
+    order = np.argsort(keys, kind='stable')
+    keys, codes, dates, values = keys[order], codes[order], dates[order], values[order]
+
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    counts = np.add.reduceat(~np.isnan(values), starts, axis=0)
+    sums = np.add.reduceat(np.nan_to_num(values), starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan).astype(np.float32)
+
+    unique_codes = codes[starts]
+    result = pd.DataFrame({
+        '측정소코드': unique_codes,
+        '측정소명': pd.Categorical.from_codes(unique_codes, categories=SEOUL_STATION_NAMES),
+        '날짜': dates[starts].astype('datetime64[ns]'),
+    })
+    for i, col in enumerate(WEATHER_VALUE_COLUMNS):
+        result[col] = means[:, i]
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump({'signature': signature, 'data': result}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return result
+
+def station_date_keys(codes, dates):
+    """
+    측정소코드와 날짜를 하나의 int64 키로 결합하는 함수 (상위 32비트: 측정소코드, 하위 32비트: 1970-01-01 기준 일수)
+
+    Parameters:
+        codes (array-like): 정수 측정소코드
+        dates (array-like): 날짜 (datetime64)
+
+    Returns:
+        np.ndarray: int64 결합 키
+    """
+    days = np.asarray(dates, dtype='datetime64[D]').astype(np.int64)
+    return (np.asarray(codes, dtype=np.int64) << 32) | (days & 0xFFFFFFFF)
+
+def merge_air_weather(air_df, weather_df, date_col='날짜', station_col='측정소명'):
+    """
+    대기질 데이터와 정규화된 기상 데이터를 (측정소코드, 날짜) 정수 키로 결합하는 함수 (inner join)
+
+    기상 데이터는 키 기준으로 정렬되어 있으므로, 대기질 행마다 이진 탐색(searchsorted)으로
+    대응하는 기상 행을 찾습니다. 대기질 행의 순서는 그대로 유지됩니다.
+
+    Parameters:
+        air_df (pd.DataFrame): 대기질 데이터 (date_col, station_col 포함, 예: air_quality_merged.csv)
+        weather_df (pd.DataFrame): preprocess_weather_data 결과
+        date_col (str): 대기질 데이터의 날짜 컬럼명 (기본값: '날짜')
+        station_col (str): 대기질 데이터의 측정소명 컬럼명 (기본값: '측정소명')
+
+    Returns:
+        pd.DataFrame: 대기질 컬럼 + 평균기온(°C), 일강수량(mm), 평균 풍속(m/s)
+    """
+    weather_keys = station_date_keys(weather_df['측정소코드'].to_numpy(), weather_df['날짜'].to_numpy())
+    # 캐시/외부에서 받은 데이터도 안전하도록 정렬 여부 확인
+    if len(weather_keys) > 1 and not (weather_keys[1:] > weather_keys[:-1]).all():
+        order = np.argsort(weather_keys, kind='stable')
+        weather_keys = weather_keys[order]
+        weather_df = weather_df.iloc[order]
+        if (weather_keys[1:] == weather_keys[:-1]).any():
+            raise ValueError("기상 데이터에 중복된 (측정소코드, 날짜) 키가 있습니다.")
+
+    air_codes = to_station_codes(air_df[station_col])
+    air_dates = pd.to_datetime(air_df[date_col]).to_numpy()
+    air_keys = station_date_keys(air_codes, air_dates)
+
+    # 정렬된 기상 키에서 대기질 키 위치 탐색
+    positions = np.searchsorted(weather_keys, air_keys)
+    positions_clipped = np.minimum(positions, max(len(weather_keys) - 1, 0))
+    matched = (air_codes >= 0) & (positions < len(weather_keys))
+    if len(weather_keys):
+        matched &= weather_keys[positions_clipped] == air_keys
+
+    merged_df = air_df[matched].reset_index(drop=True)
+    weather_rows = positions_clipped[matched]
+    for col in WEATHER_VALUE_COLUMNS:
+        merged_df[col] = weather_df[col].to_numpy()[weather_rows]
+
+    return merged_df